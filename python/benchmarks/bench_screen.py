@@ -0,0 +1,127 @@
+# benchmark 'get_data' against a local stand-in for the Yahoo Finance API and
+# 'Process.cols' and 'Process.align' alone at 250, 5,000, and 50,000 rows
+#   pip install pytest-benchmark
+#   python -m pytest benchmarks/bench_screen.py --benchmark-autosave
+# and fail when the mean time of a benchmark regresses by more than 20%
+#   python -m pytest benchmarks/bench_screen.py --benchmark-compare --benchmark-compare-fail=mean:20%
+import json
+import threading
+import http.server
+import pytest
+import yfscreen as yfs
+from yfscreen.screen import Api, Limiter, Process
+from quotes import quotes
+
+pytest.importorskip("pytest_benchmark")
+
+test_sizes = [250, 5000, 50000]
+
+class Handler(http.server.BaseHTTPRequestHandler):
+
+  protocol_version = "HTTP/1.1"
+
+  def send(self, content, content_type):
+
+    self.send_response(200)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Content-Length", str(len(content)))
+    self.send_header("Set-Cookie", "A3=d=benchmark; Path=/")
+    self.end_headers()
+    self.wfile.write(content)
+
+  def do_GET(self):
+
+    if not self.path.startswith("/v1/test/getcrumb"):
+      self.send_error(404)
+      return
+
+    self.send(b"crumb", "text/plain")
+
+  def do_POST(self):
+
+    if not self.path.startswith("/v1/finance/screener"):
+      self.send_error(404)
+      return
+
+    payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+    self.send(self.server.page(payload["offset"], payload["size"]), "application/json")
+
+  def log_message(self, *args):
+    pass
+
+class Server(http.server.ThreadingHTTPServer):
+
+  daemon_threads = True
+
+  # serves pages of the same synthetic quotes with the nested fields of the API
+  def __init__(self, n):
+    super().__init__(("127.0.0.1", 0), Handler)
+    self.quotes = quotes(n)
+    self.pages = {}
+    self.lock = threading.Lock()
+
+  def page(self, offset, size):
+
+    with self.lock:
+
+      if ((offset, size) not in self.pages):
+
+        result = {"finance": {"result": [{"quotes": self.quotes[offset:offset + size]}]}}
+        self.pages[(offset, size)] = json.dumps(result).encode("utf-8")
+
+      return self.pages[(offset, size)]
+
+@pytest.fixture(scope = "module")
+def server():
+
+  result = Server(max(test_sizes))
+  thread = threading.Thread(target = result.serve_forever, daemon = True)
+  thread.start()
+
+  yield "http://127.0.0.1:" + str(result.server_address[1])
+
+  result.shutdown()
+  result.server_close()
+
+@pytest.fixture
+def session(server, monkeypatch):
+
+  monkeypatch.setattr(Api, "crumb_url", server + "/v1/test/getcrumb")
+  monkeypatch.setattr(Api, "screener_url", server + "/v1/finance/screener")
+
+  # requests are not limited so that the benchmark measures the library
+  monkeypatch.setattr(Limiter, "_default", None)
+
+  result = yfs.get_session()
+
+  yield result
+
+  result["handle"].close()
+
+@pytest.mark.parametrize("n", test_sizes)
+def test_get_data(benchmark, session, n):
+
+  payload = yfs.create_payload(size = n)
+
+  result = benchmark(yfs.get_data, payload = payload, session = session, workers = 4)
+
+  assert len(result) == n
+
+@pytest.mark.parametrize("n", test_sizes)
+def test_cols(benchmark, n):
+
+  df = Process.frame(quotes(n))
+
+  result = benchmark(Process.cols, df)
+
+  assert len(result) == n
+
+@pytest.mark.parametrize("n", test_sizes)
+def test_align(benchmark, n):
+
+  dfs = [Process.page(quotes(min(n, 250), seed = i)) for i in range(max(n // 250, 1))]
+
+  result = benchmark(Process.align, dfs)
+
+  assert len(result) == n
@@ -0,0 +1,70 @@
+# compare 'Process.cols' with the previous implementation on synthetic pages
+#   python benchmarks/cols.py
+import timeit
+import pandas as pd
+from yfscreen.screen import Process
+from quotes import quotes
+
+def cols(df):
+
+  for col in df.columns:
+
+    if df[col].apply(lambda x: isinstance(x, list)).all():
+
+      status_df = df[col].apply(lambda x: all(isinstance(i, dict) for i in x)).all()
+
+      if status_df:
+
+        cols = set()
+
+        for row in df[col]:
+          for item in row:
+
+            flattened_item = pd.json_normalize(item, sep = ".", max_level = None)
+            cols.update(flattened_item.columns)
+
+        row_na = {key: None for key in cols}
+
+        result_ls = []
+
+        for row in df[col]:
+
+          if (len(row) == 0):
+            result_ls.append(row_na)
+          else:
+
+            flattened_row = pd.json_normalize(row[0]).to_dict(orient = "records")[0]
+            result = {key: flattened_row.get(key, None) for key in cols}
+
+            cols_na = cols - result.keys()
+
+            for col_na in cols_na:
+              result[col_na] = None
+
+            result_ls.append(result)
+
+        result_df = pd.DataFrame(result_ls)
+        df = pd.concat([df.reset_index(drop = True), result_df], axis = 1)
+
+        df.drop(columns = [col], inplace = True)
+
+      else:
+        df[col] = None
+
+  return df
+
+if __name__ == "__main__":
+
+  for n in [250, 5000]:
+
+    df = pd.json_normalize(quotes(n))
+
+    expected = cols(df.copy())
+    result = Process.cols(df.copy())
+
+    pd.testing.assert_frame_equal(result, expected[result.columns])
+
+    time_old = min(timeit.repeat(lambda: cols(df.copy()), number = 1, repeat = 3))
+    time_new = min(timeit.repeat(lambda: Process.cols(df.copy()), number = 1, repeat = 3))
+
+    print(f"{n} rows: {time_old * 1000:.1f} ms -> {time_new * 1000:.1f} ms ({time_old / time_new:.0f}x)")
@@ -0,0 +1,30 @@
+# compare decoding and normalizing a page with the standard library and 'pd.json_normalize'
+# with 'Process.loads' (orjson when available) and 'Process.frame'
+#   python benchmarks/decode.py
+import json
+import timeit
+import pandas as pd
+from yfscreen import screen
+from yfscreen.screen import Process
+from quotes import quotes
+
+def old(content):
+  return pd.json_normalize(json.loads(content)["finance"]["result"][0]["quotes"])
+
+def new(content):
+  return Process.frame(Process.loads(content)["finance"]["result"][0]["quotes"])
+
+if __name__ == "__main__":
+
+  print("decoder: " + ("orjson" if screen.orjson is not None else "json"))
+
+  for n in [250, 5000]:
+
+    content = json.dumps({"finance": {"result": [{"quotes": quotes(n)}]}}).encode("utf-8")
+
+    pd.testing.assert_frame_equal(new(content), old(content))
+
+    time_old = min(timeit.repeat(lambda: old(content), number = 5, repeat = 3)) / 5
+    time_new = min(timeit.repeat(lambda: new(content), number = 5, repeat = 3)) / 5
+
+    print(f"{n} rows: {time_old * 1000:.1f} ms -> {time_new * 1000:.1f} ms ({time_old / time_new:.1f}x)")
@@ -0,0 +1,22 @@
+# compare the memory of a data frame with and without 'compact'
+#   python benchmarks/memory.py
+import pandas as pd
+from yfscreen.screen import Process
+from quotes import quotes
+
+if __name__ == "__main__":
+
+  n = 20000
+
+  pages = [Process.page(quotes(250, seed = i)) for i in range(n // 250)]
+
+  result = Process.align(pages)
+  result_compact = Process.compact(Process.align([Process.compact(page, "equity") for page in pages]),
+                                   "equity")
+
+  size = result.memory_usage(deep = True).sum()
+  size_compact = result_compact.memory_usage(deep = True).sum()
+
+  print(f"{n} rows, {result.shape[1]} columns: {size / 1024 ** 2:.1f} MB")
+  print(f"{n} rows, {result_compact.shape[1]} columns (compact): {size_compact / 1024 ** 2:.1f} MB " +
+        f"({size / size_compact:.1f}x smaller)")
@@ -0,0 +1,91 @@
+# synthetic quotes with the nested fields of the Yahoo Finance API
+import random
+
+def value(raw, fmt = None, long_fmt = False):
+
+  result = {"raw": raw, "fmt": fmt if fmt is not None else f"{raw:.2f}"}
+
+  if long_fmt:
+    result["longFmt"] = f"{raw:,}"
+
+  return result
+
+def quote(i):
+
+  exchange = random.choice([("NMS", "NasdaqGS"), ("NYQ", "NYSE"), ("ASE", "NYSE American")])
+  price = random.uniform(1, 500)
+  shares = random.randint(10 ** 6, 10 ** 10)
+
+  events = [
+    {"header": "Dividend", "message": "Dividend of 0.25 per share",
+     "meta": {"eventType": "DIVIDEND", "dateEpochMs": 1700000000000 + i, "amount": value(0.25)}},
+    {"header": "Split", "message": "2:1 split",
+     "meta": {"eventType": "SPLIT", "dateEpochMs": 1600000000000 + i}}
+  ]
+
+  result = {
+    "language": "en-US",
+    "region": "US",
+    "quoteType": "EQUITY",
+    "typeDisp": "Equity",
+    "quoteSourceName": "Nasdaq Real Time Price",
+    "triggerable": True,
+    "customPriceAlertConfidence": "HIGH",
+    "currency": "USD",
+    "exchange": exchange[0],
+    "fullExchangeName": exchange[1],
+    "exchangeTimezoneName": "America/New_York",
+    "exchangeTimezoneShortName": "EDT",
+    "gmtOffSetMilliseconds": -14400000,
+    "market": "us_market",
+    "marketState": random.choice(["REGULAR", "CLOSED"]),
+    "esgPopulated": False,
+    "tradeable": False,
+    "cryptoTradeable": False,
+    "hasPrePostMarketData": True,
+    "firstTradeDateMilliseconds": 345479400000 + i,
+    "priceHint": 2,
+    "sourceInterval": 15,
+    "exchangeDataDelayedBy": 0,
+    "symbol": "S" + str(i),
+    "shortName": "Company " + str(i),
+    "longName": "Company " + str(i) + " Inc.",
+    "messageBoardId": "finmb_" + str(i),
+    "averageAnalystRating": random.choice(["1.8 - Buy", "2.5 - Buy", "3.0 - Hold"]),
+    "regularMarketPrice": value(price),
+    "regularMarketChange": value(random.uniform(-5, 5)),
+    "regularMarketChangePercent": value(random.uniform(-5, 5)),
+    "regularMarketVolume": value(random.randint(10 ** 4, 10 ** 8), long_fmt = True),
+    "regularMarketDayHigh": value(price * 1.01),
+    "regularMarketDayLow": value(price * 0.99),
+    "regularMarketOpen": value(price),
+    "regularMarketPreviousClose": value(price),
+    "regularMarketTime": value(1700000000 + i, "4:00PM EDT"),
+    "marketCap": value(int(price * shares), long_fmt = True),
+    "sharesOutstanding": value(shares, long_fmt = True),
+    "averageDailyVolume3Month": value(random.randint(10 ** 4, 10 ** 8), long_fmt = True),
+    "fiftyDayAverage": value(price),
+    "twoHundredDayAverage": value(price),
+    "fiftyTwoWeekHigh": value(price * 1.3),
+    "fiftyTwoWeekLow": value(price * 0.7),
+    "fiftyTwoWeekRange": value(0, f"{price * 0.7:.2f} - {price * 1.3:.2f}"),
+    "trailingPE": value(random.uniform(5, 60)),
+    "forwardPE": value(random.uniform(5, 60)),
+    "epsTrailingTwelveMonths": value(random.uniform(-2, 20)),
+    "bookValue": value(random.uniform(1, 100)),
+    "priceToBook": value(random.uniform(0.5, 20)),
+    "dividendYield": value(random.uniform(0, 5)),
+    "beta": value(random.uniform(0, 3)),
+    "corporateActions": random.choice([[], events, events[1:]]),
+    "tags": random.choice([[], ["a", "b"]])
+  }
+
+  return result
+
+def quotes(n, seed = 1):
+
+  random.seed(seed)
+
+  result = [quote(i) for i in range(n)]
+
+  return result
@@ -0,0 +1,21 @@
+# compare the time to import 'yfscreen' with the time to import its dependencies and data
+#   python benchmarks/startup.py
+import sys
+import subprocess
+import timeit
+
+def run(code):
+  return min(timeit.repeat(lambda: subprocess.run([sys.executable, "-c", code], check = True),
+                           number = 1, repeat = 10))
+
+if __name__ == "__main__":
+
+  time_none = run("pass")
+  time_lazy = run("import yfscreen")
+  time_eager = run("import yfscreen as yfs; from yfscreen.screen import Data; " +
+                   "[getattr(Data, name) for name in ['filters', 'categoryname', 'exchange', " +
+                   "'fundfamilyname', 'industry', 'peer_group', 'region', 'sector', 'errors']]")
+
+  print(f"interpreter: {time_none * 1000:.0f} ms")
+  print(f"import yfscreen: {max(time_lazy - time_none, 0) * 1000:.0f} ms")
+  print(f"import yfscreen with pandas, requests, and data: {(time_eager - time_none) * 1000:.0f} ms")
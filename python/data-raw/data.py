@@ -0,0 +1,10 @@
+# build the memory-mapped data files from the CSV files
+#   python data-raw/data.py
+import numpy as np
+from yfscreen.screen import Data
+
+names = ["filters", "categoryname", "exchange", "fundfamilyname", "industry", "peer_group",
+         "region", "sector", "errors"]
+
+for name in names:
+  np.save("yfscreen/data/" + name + ".npy", Data.build(name), allow_pickle = False)
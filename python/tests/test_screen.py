@@ -1,11 +1,126 @@
-# import pytest
+import pytest
+import json
 import time
+import pickle
+import threading
+import http.server
+import concurrent.futures
+import requests
+import importlib.resources
+import numpy as np
 import pandas as pd
 import yfscreen as yfs
-from yfscreen.screen import Process
+from yfscreen.screen import Check, Data, Process
 
 # @pytest.mark.skip(reason = "long-running test")
 
+class Response:
+
+  def __init__(self, result, status_code = 200):
+    self.result = result
+    self.status_code = status_code
+    self.text = str(result)
+    self.content = json.dumps(result).encode("utf-8")
+    self.headers = {}
+
+  def json(self):
+    return self.result
+
+class Handle:
+
+  # offline stand-in for 'requests.Session' that serves 'n' synthetic quotes
+  def __init__(self, n, crumb = "crumb"):
+    self.n = n
+    self.crumb = crumb
+    self.cookies = requests.cookies.RequestsCookieJar()
+
+  def get(self, url):
+    return Response(self.crumb)
+
+  def post(self, url, params = None, json = None, headers = None):
+
+    if (params["crumb"] != self.crumb):
+      return Response({"finance": {"error": "Unauthorized"}}, 401)
+
+    quotes = [{"symbol": "S" + str(i), "price": {"raw": float(i), "fmt": str(i)}}
+              for i in range(json["offset"], min(json["offset"] + json["size"], self.n))]
+
+    return Response({"finance": {"result": [{"quotes": quotes}]}})
+
+class AsyncResponse(Response):
+
+  def __init__(self, result, status_code = 200):
+    super().__init__(result, status_code)
+    self.body = self.__dict__.pop("text")
+
+  @property
+  def status(self):
+    return self.status_code
+
+  async def text(self):
+    return self.body
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *args):
+    return False
+
+  async def read(self):
+    return self.content
+
+class AsyncHandle(Handle):
+
+  # offline stand-in for 'aiohttp.ClientSession'
+  def __init__(self, n):
+    super().__init__(n)
+    self.cookie_jar = self
+    self.closed = False
+    self.count = 0
+
+  def update_cookies(self, cookies):
+    self.cookies.update(cookies)
+
+  def __iter__(self):
+    return iter([])
+
+  def get(self, url):
+
+    self.count += 1
+
+    return AsyncResponse(self.crumb)
+
+  def post(self, url, params = None, json = None, headers = None):
+
+    result = super().post(url, params, json, headers)
+
+    return AsyncResponse(result.result, result.status_code)
+
+  async def close(self):
+    self.closed = True
+
+class AsyncFlakyHandle(AsyncHandle):
+
+  # fails the windows at 'offsets' with status 500 or raises 'error' when provided
+  def __init__(self, n, offsets, error = None):
+    super().__init__(n)
+    self.offsets = offsets
+    self.error = error
+
+  def post(self, url, params = None, json = None, headers = None):
+
+    if (json["offset"] in self.offsets):
+
+      if self.error is not None:
+        raise self.error()
+
+      return AsyncResponse({"finance": {"error": "Internal Server Error"}}, 500)
+
+    return super().post(url, params, json, headers)
+
+def get_session(n):
+  return {"handle": Handle(n), "crumb": "crumb", "cookies": {}}
+
 # aligned (shared columns) and misaligned (missing columns, mixed
 # types, and zero rows) data frames
 test_aligns = [
@@ -189,3 +304,831 @@ def test_align(): # valid 'dfs'
   result_df = pd.DataFrame(result_ls)
 
   pd.testing.assert_frame_equal(result_df, pd.DataFrame())
+
+def test_workers(): # valid 'workers'
+
+  result_ls = []
+  errors_ls = []
+
+  payload = yfs.create_payload(size = 1000)
+
+  for workers in [1, 4]:
+
+    try:
+
+      result = yfs.get_data(payload = payload, session = get_session(620), workers = workers)
+
+      assert list(result["symbol"]) == ["S" + str(i) for i in range(620)]
+      response = "success"
+
+    except:
+      response = None
+
+    if response is None:
+
+      errors_ls.append({
+        "call": "get_data",
+        "value": workers
+      })
+
+  if (len(errors_ls) > 0):
+    result_ls.extend(errors_ls)
+
+  result_df = pd.DataFrame(result_ls)
+
+  pd.testing.assert_frame_equal(result_df, pd.DataFrame())
+
+def test_limiter(): # valid 'rate' and 'burst'
+
+  limiter = yfs.Limiter(rate = 100, burst = 2)
+
+  start = time.monotonic()
+
+  for i in range(6):
+    limiter.acquire()
+
+  # two tokens at once and then one token every 1 / 'rate' seconds
+  assert time.monotonic() - start >= 0.04
+
+class Handler(http.server.BaseHTTPRequestHandler):
+
+  # local stand-in for the Yahoo Finance API that serves the quotes of 'Handle'
+  def send(self, result):
+
+    content = json.dumps(result).encode("utf-8")
+
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(content)))
+    self.end_headers()
+    self.wfile.write(content)
+
+  def do_GET(self):
+    self.send("crumb")
+
+  def do_POST(self):
+
+    payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+    self.send(Handle(self.server.n).post(None, {"crumb": "crumb"}, payload).result)
+
+  def log_message(self, *args):
+    pass
+
+def test_processes(monkeypatch): # valid 'processes'
+
+  from yfscreen.screen import Api
+
+  # worker processes request pages from a local server with any start method
+  server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+  server.n = 620
+
+  thread = threading.Thread(target = server.serve_forever, daemon = True)
+  thread.start()
+
+  url = "http://127.0.0.1:" + str(server.server_address[1])
+
+  monkeypatch.setattr(Api, "crumb_url", url + "/v1/test/getcrumb")
+  monkeypatch.setattr(Api, "screener_url", url + "/v1/finance/screener")
+
+  try:
+
+    payload = yfs.create_payload(size = 1000)
+    stats = yfs.Stats()
+
+    result = yfs.get_data(payload = payload, workers = 4, processes = 2, stats = stats,
+                          limiter = yfs.Limiter(rate = 100, shared = True))
+
+    pd.testing.assert_frame_equal(result, yfs.get_data(payload = payload, session = get_session(620)))
+
+    assert stats.to_dict()["pages"] == 4
+
+  finally:
+
+    server.shutdown()
+    server.server_close()
+
+  with pytest.raises(ValueError):
+    yfs.get_data(payload = payload, processes = 0)
+
+def test_aio(): # valid 'workers'
+
+  pytest.importorskip("aiohttp")
+
+  import asyncio
+  from yfscreen import aio
+
+  payload = yfs.create_payload(size = 1000)
+
+  for workers in [1, 4]:
+
+    session = {"handle": AsyncHandle(620), "crumb": "crumb", "cookies": {}}
+
+    result = asyncio.run(aio.get_data(payload = payload, session = session, workers = workers))
+    expected = yfs.get_data(payload = payload, session = get_session(620))
+
+    pd.testing.assert_frame_equal(result, expected)
+
+  # failed windows are reported and the windows after them are still requested
+  session = {"handle": AsyncFlakyHandle(620, [250]), "crumb": "crumb", "cookies": {}}
+  retry = yfs.Retry(attempts = 2, backoff = 0)
+
+  result = asyncio.run(aio.get_data(payload = payload, session = session, workers = 2,
+                                    retry = retry))
+
+  assert len(result) == 370
+  assert [(value["offset"], value["size"]) for value in result.attrs["failed"]] == [(250, 250)]
+
+  # a rejected crumb is refreshed once before the next attempt
+  session = {"handle": AsyncHandle(620), "crumb": "old", "cookies": {}}
+
+  result = asyncio.run(aio.get_data(payload = payload, session = session, workers = 4,
+                                    retry = retry))
+
+  assert len(result) == 620
+  assert (session["crumb"], session["handle"].count) == ("crumb", 1)
+
+  # a cancelled page is cancelled instead of treated as empty
+  session = {"handle": AsyncFlakyHandle(620, [0], error = asyncio.CancelledError),
+             "crumb": "crumb", "cookies": {}}
+
+  with pytest.raises(asyncio.CancelledError):
+    asyncio.run(aio.get_data(payload = payload, session = session, retry = retry))
+
+def test_cols(): # valid 'df'
+
+  df = pd.DataFrame({
+    "symbol": ["AAPL", "MSFT"],
+    "events": [
+      [{"header": "Dividend", "meta": {"amount": 0.25}}, {"header": "Split", "meta": {"ratio": 4}}],
+      []
+    ],
+    "tags": [["a"], []]
+  })
+
+  result = Process.cols(df)
+
+  expected = pd.DataFrame({
+    "symbol": ["AAPL", "MSFT"],
+    "tags": [None, None],
+    "header": ["Dividend", None],
+    "meta.amount": [0.25, None],
+    "meta.ratio": [None, None]
+  })
+
+  pd.testing.assert_frame_equal(result, expected)
+
+def test_iter(): # valid 'payload'
+
+  payload = yfs.create_payload(size = 1000)
+
+  result_ls = list(yfs.iter_data(payload = payload, session = get_session(620), workers = 2))
+
+  assert [len(result) for result in result_ls] == [250, 250, 120]
+
+  pd.testing.assert_frame_equal(Process.align(result_ls),
+                                yfs.get_data(payload = payload, session = get_session(620)))
+
+def test_refresh(): # rejected 'crumb'
+
+  session = {"handle": Handle(620, crumb = "new"), "crumb": "old", "cookies": {}}
+
+  result = yfs.get_data(payload = yfs.create_payload(size = 1000), session = session)
+
+  assert len(result) == 620
+  assert session["crumb"] == "new"
+
+class FlakyHandle(Handle):
+
+  # fails the windows at 'offsets' with 'status_code' for the first 'count' requests
+  def __init__(self, n, offsets, status_code, count):
+    super().__init__(n)
+    self.offsets = offsets
+    self.status_code = status_code
+    self.count = count
+
+  def post(self, url, params = None, json = None, headers = None):
+
+    if (json["offset"] in self.offsets) and (self.count > 0):
+
+      self.count -= 1
+
+      result = Response({"finance": {"error": "Too Many Requests"}}, self.status_code)
+      result.headers["Retry-After"] = "0"
+
+      return result
+
+    return super().post(url, params, json, headers)
+
+def test_retry(): # valid 'retry'
+
+  payload = yfs.create_payload(size = 1000)
+  retry = yfs.Retry(attempts = 3, backoff = 0)
+
+  session = {"handle": FlakyHandle(620, [250], 429, 2), "crumb": "crumb", "cookies": {}}
+  result = yfs.get_data(payload = payload, session = session, retry = retry)
+
+  assert len(result) == 620
+  assert result.attrs["failed"] == []
+
+  # failed windows are reported and the windows after them are still requested
+  session = {"handle": FlakyHandle(620, [250], 500, 3), "crumb": "crumb", "cookies": {}}
+  result = yfs.get_data(payload = payload, session = session, workers = 2, retry = retry)
+
+  assert len(result) == 370
+  assert [(value["offset"], value["size"]) for value in result.attrs["failed"]] == [(250, 250)]
+
+  session = {"handle": FlakyHandle(620, [0], 500, 3), "crumb": "crumb", "cookies": {}}
+  result = yfs.get_data(payload = payload, session = session, retry = retry)
+
+  assert len(result) == 0
+  assert [(value["offset"], value["size"]) for value in result.attrs["failed"]] == [(0, 1000)]
+
+  result = yfs.get_data_batch([payload], session = session, workers = 2, retry = retry)
+
+  assert len(result[0]) == 620
+
+  # the Retry-After header does not wait longer than 'max_backoff'
+  response = Response({}, 429)
+  response.headers["Retry-After"] = "3600"
+
+  assert yfs.Retry(max_backoff = 2).delay(0, response) == 2
+
+  pytest.importorskip("pyarrow")
+
+  # failed windows of a table are appended to 'failed'
+  session = {"handle": FlakyHandle(620, [250], 500, 3), "crumb": "crumb", "cookies": {}}
+  failed = []
+
+  result = yfs.get_data(payload = payload, session = session, workers = 2, retry = retry,
+                        output = "arrow", failed = failed)
+
+  assert result.num_rows == 370
+  assert [(value["offset"], value["size"]) for value in failed] == [(250, 250)]
+
+class SlowHandle(Handle):
+
+  # counts the requests that take 'delay' seconds each
+  def __init__(self, n, delay):
+    super().__init__(n)
+    self.delay = delay
+    self.count = 0
+
+  def post(self, url, params = None, json = None, headers = None):
+
+    self.count += 1
+    time.sleep(self.delay)
+
+    return super().post(url, params, json, headers)
+
+def test_shared(monkeypatch): # valid 'pool_size' and 'ttl'
+
+  from yfscreen.screen import Session
+
+  session = {"handle": requests.Session(), "crumb": "crumb", "cookies": {}}
+  refreshed = []
+  event = threading.Event()
+
+  def refresh(session, *args, **kwargs):
+
+    refreshed.append(session)
+    event.wait(5)
+
+  monkeypatch.setattr(Session, "_shared", session)
+  monkeypatch.setattr(Session, "_time", time.monotonic())
+  monkeypatch.setattr(Session, "_pool_size", 10)
+  monkeypatch.setattr(Session, "refresh", staticmethod(refresh))
+  event.set()
+
+  # the pool grows to the workers of a call
+  result = Session.shared(pool_size = 16)
+
+  assert result is session
+  assert session["handle"].get_adapter("https://")._pool_maxsize == 16
+
+  # an expired crumb is refreshed with the same handle
+  result = Session.shared(ttl = 0)
+
+  assert result is session
+  assert refreshed == [session]
+
+  # other threads get the session while the crumb is refreshed
+  event.clear()
+
+  with concurrent.futures.ThreadPoolExecutor(max_workers = 1) as executor:
+
+    future = executor.submit(Session.shared, ttl = 0)
+
+    while (len(refreshed) < 2):
+      time.sleep(0.01)
+
+    start = time.monotonic()
+    result = Session.shared()
+
+    assert result is session
+    assert time.monotonic() - start < 1
+
+    event.set()
+    future.result()
+
+  session["handle"].close()
+
+def test_coalesce(): # concurrent 'payload'
+
+  session = {"handle": SlowHandle(620, 0.2), "crumb": "crumb", "cookies": {}}
+  payload = yfs.create_payload(size = 1000)
+
+  with concurrent.futures.ThreadPoolExecutor(max_workers = 4) as executor:
+
+    futures = [executor.submit(yfs.get_data, payload = payload, session = session, limiter = None)
+               for i in range(4)]
+
+    result = [future.result() for future in futures]
+
+  # one request for each page is shared by all calls
+  assert session["handle"].count == 3
+
+  for result_df in result:
+    pd.testing.assert_frame_equal(result_df, result[0])
+
+def test_stats(): # valid 'stats'
+
+  events = []
+
+  stats = yfs.Stats(hook = events.append)
+  session = {"handle": FlakyHandle(620, [250], 429, 1), "crumb": "old", "cookies": {}}
+
+  yfs.get_data(payload = yfs.create_payload(size = 1000), session = session,
+               retry = yfs.Retry(backoff = 0), stats = stats)
+
+  result = stats.to_dict()
+
+  assert result["pages"] == 3
+  assert result["rows"] == 620
+  assert result["retries"] == 2
+  assert result["requests"] == 5
+  assert result["bytes"] > 0
+  assert result["counts"]["crumb"] == 1
+  assert result["counts"]["decode"] == 3
+  assert len(events) == sum(result["counts"].values())
+
+def test_columns(tmp_path): # valid 'columns'
+
+  cache = yfs.Cache(path = str(tmp_path))
+  payload = yfs.create_payload(size = 1000)
+
+  result = yfs.get_data(payload = payload, session = get_session(620), cache = cache,
+                        columns = ["price.raw", "symbol"])
+
+  assert list(result.columns) == ["symbol", "price.raw"]
+  assert len(result) == 620
+
+  # pages with other columns are not returned from the cache
+  result = yfs.get_data(payload = payload, session = get_session(620), cache = cache,
+                        columns = ["price"])
+
+  assert list(result.columns) == ["price.raw", "price.fmt"]
+
+  with pytest.raises(ValueError):
+    yfs.get_data(payload = payload, columns = "symbol")
+
+def test_cli(monkeypatch, capsys, tmp_path): # valid 'argv'
+
+  from yfscreen import cli
+  from yfscreen.screen import Session
+
+  monkeypatch.setattr(Session, "shared", staticmethod(lambda **kwargs: get_session(620)))
+
+  status = cli.main(["-f", "gt", "dayvolume", "5000000", "-n", "300", "--format", "ndjson",
+                     "-c", "symbol", "-j", "2"])
+  result = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+  assert status == 0
+  assert result[:2] == [{"symbol": "S0"}, {"symbol": "S1"}]
+  assert len(result) == 300
+
+  status = cli.main(["-n", "10"])
+  result = capsys.readouterr().out.splitlines()
+
+  assert result[:2] == ["symbol,price.raw,price.fmt", "S0,0.0,0"]
+  assert len(result) == 11
+
+  with pytest.raises(SystemExit):
+    cli.main(["-f", "eq", "region"])
+
+  capsys.readouterr()
+
+  pytest.importorskip("pyarrow")
+
+  import pyarrow.parquet as pq
+
+  # failed windows of the parquet file are reported with the exit status
+  session = {"handle": FlakyHandle(620, [250], 500, 10), "crumb": "crumb", "cookies": {}}
+  path = str(tmp_path / "data.parquet")
+
+  monkeypatch.setattr(Session, "shared", staticmethod(lambda **kwargs: session))
+
+  status = cli.main(["-n", "1000", "--format", "parquet", "-o", path, "-j", "2"])
+
+  assert status == 1
+  assert capsys.readouterr().err == "yfscreen: failed to get rows 250-500\n"
+  assert pq.read_table(path).num_rows == 370
+
+  with pytest.raises(SystemExit):
+    cli.main(["--format", "parquet", "-o", path, "--compact"])
+
+  # errors of the download are raised instead of reported as usage errors
+  def error(*args, **kwargs):
+    raise ValueError("download")
+
+  monkeypatch.setattr(cli, "write", error)
+
+  with pytest.raises(ValueError, match = "download"):
+    cli.main(["-n", "10"])
+
+def test_tuner(): # valid 'tuner'
+
+  tuner = yfs.Tuner(workers = 4, rate = 10)
+
+  # the second request waits for the rate of the tuner
+  tuner.acquire()
+  tuner.acquire()
+  tuner.update(0.1, 200)
+
+  assert tuner.to_dict()["workers"] == 4
+  assert tuner.rate > 10
+
+  # one decrease for the responses of the same round trip
+  tuner.update(0.1, 429)
+  tuner.update(0.1, 429)
+
+  assert tuner.to_dict()["workers"] == 2
+
+  # a large 'slowdown' so that the jitter of the offline responses is not slow
+  tuner = yfs.Tuner(**dict(tuner.to_dict(), rate = 50, slowdown = 100))
+  session = {"handle": SlowHandle(5000, 0.01), "crumb": "crumb", "cookies": {}}
+
+  yfs.get_data(payload = yfs.create_payload(size = 5000), session = session, workers = 8,
+               limiter = yfs.Limiter(rate = 100, burst = 8), tuner = tuner)
+
+  assert 2 < tuner.to_dict()["workers"] <= 8
+
+  # values are only increased up to the workers and limiter of the call
+  tuner = yfs.Tuner(workers = 4, rate = 10, slowdown = 100)
+
+  yfs.get_data(payload = yfs.create_payload(size = 1000), session = get_session(1000),
+               limiter = yfs.Limiter(rate = 100, burst = 100), tuner = tuner)
+
+  assert tuner.to_dict()["workers"] == 1
+
+  yfs.get_data(payload = yfs.create_payload(size = 1000), session = get_session(1000),
+               limiter = yfs.Limiter(rate = 8, burst = 8), workers = 2, tuner = tuner)
+
+  assert tuner.to_dict()["workers"] == 2
+  assert tuner.to_dict()["rate"] <= 8
+
+  # other errors do not change the values
+  expected = tuner.to_dict()
+  tuner.update(0.1, 401)
+
+  assert tuner.to_dict() == expected
+
+  # one unusually fast response is forgotten after the window of recent responses
+  tuner = yfs.Tuner(workers = 4)
+
+  tuner.update(0.001, 200)
+
+  for i in range(40):
+    tuner.update(0.1, 200)
+
+  assert min(tuner.latency) == 0.1
+  assert tuner.to_dict()["workers"] > 4
+
+  with pytest.raises(ValueError):
+    yfs.Tuner(slowdown = 1)
+
+def test_cache(tmp_path): # valid 'cache'
+
+  cache = yfs.Cache(path = str(tmp_path), ttl = {"equity": 60})
+  payload = yfs.create_payload(size = 1000)
+
+  expected = yfs.get_data(payload = payload, session = get_session(620), cache = cache)
+
+  # pages are returned from the cache without a request
+  result = yfs.get_data(payload = payload, session = get_session(0), cache = cache)
+
+  pd.testing.assert_frame_equal(result, expected)
+
+  cache = yfs.Cache(path = str(tmp_path), ttl = 0)
+  result = yfs.get_data(payload = payload, session = get_session(0), cache = cache)
+
+  pd.testing.assert_frame_equal(result, pd.DataFrame())
+
+  # truncated files and other objects are misses
+  cache = yfs.Cache(path = str(tmp_path), ttl = 60)
+
+  with open(cache.file(payload, 0, 250, "pandas"), "wb") as f:
+    f.write(b"\x80")
+
+  with open(cache.file(payload, 250, 250, "pandas"), "wb") as f:
+    pickle.dump([1, 2], f)
+
+  assert cache.get(payload, 0, 250) is None
+  assert cache.get(payload, 250, 250) is None
+
+def test_index(): # valid 'sec_type', 'field', and 'sort_field'
+
+  for sec_type in yfs.data_filters["sec_type"].unique():
+
+    fields = set(yfs.data_filters.loc[yfs.data_filters["sec_type"] == sec_type, "field"])
+    error_fields = set(yfs.data_errors.loc[yfs.data_errors["sec_type"] == sec_type, "field"])
+    error_sort_fields = set(yfs.data_errors.loc[yfs.data_errors["sec_type"] == sec_type, "sort_field"])
+
+    assert Check.index[sec_type]["fields"] == fields.difference(error_fields)
+    assert Check.index[sec_type]["sort_fields"] == fields.difference(error_sort_fields)
+
+def test_data(): # valid 'data'
+
+  names = ["filters", "categoryname", "exchange", "fundfamilyname", "industry", "peer_group",
+           "region", "sector", "errors"]
+
+  data_path = importlib.resources.files("yfscreen") / "data" / "industry.csv"
+
+  # the prebuilt files match the CSV files
+  for name in names:
+
+    result = Data.array(name)
+
+    assert isinstance(result, np.memmap)
+    assert result.tobytes() == Data.build(name).tobytes()
+
+  pd.testing.assert_frame_equal(yfs.data_industry, pd.read_csv(data_path))
+
+  assert Data.sector_of("Semiconductors") == "Technology"
+  assert Data.sector_of("invalid") is None
+  assert Data.fields("equity") == list(yfs.data_filters.loc[yfs.data_filters["sec_type"] == "equity", "field"])
+
+def test_batch(): # valid 'payloads'
+
+  payloads = {
+    "small": yfs.create_payload(size = 100),
+    "large": yfs.create_payload(size = 1000)
+  }
+
+  session = get_session(620)
+
+  result = yfs.get_data_batch(payloads, session = session, workers = 3)
+
+  for key, payload in payloads.items():
+    pd.testing.assert_frame_equal(result[key], yfs.get_data(payload = payload, session = session))
+
+  result = yfs.get_data_batch(list(payloads.values()), session = session, concat = True)
+
+  assert list(result["key"].value_counts().sort_index()) == [100, 620]
+
+def test_compile(): # valid 'query'
+
+  filters = [
+    ["eq", ["region", "us"]],
+    ["eq", ["region", "us"]],
+    ["btwn", ["intradaymarketcap", 2000000000, 10000000000]],
+    ["btwn", ["intradaymarketcap", 10000000000, 100000000000]],
+    ["gt", ["dayvolume", 5000000]]
+  ]
+
+  result = yfs.create_query(filters)
+
+  expected = {
+    "operator": "and",
+    "operands": [
+      {"operator": "or", "operands": [{"operator": "gt", "operands": ["dayvolume", 5000000]}]},
+      {"operator": "or", "operands": [{"operator": "btwn", "operands": ["intradaymarketcap", 2000000000, 100000000000]}]},
+      {"operator": "or", "operands": [{"operator": "eq", "operands": ["region", "us"]}]}
+    ]
+  }
+
+  assert result == expected
+  assert yfs.create_query(filters[::-1]) == expected
+
+  # ranges that do not overlap or cover every value are not merged
+  filters = [["lt", ["x", 5]], ["gt", ["x", 5]], ["btwn", ["x", 1, 3]], ["gt", ["y", 1]], ["lt", ["y", 2]]]
+
+  query = yfs.create_query(filters, "or")
+  result = [[x["operands"] for x in operand["operands"]] for operand in query["operands"]]
+
+  assert result == [[["x", 5], ["x", 5]], [["y", 2], ["y", 1]]]
+
+  # the groups of the top-level "or" are kept for the validation of fields
+  query = yfs.create_query([["eq", ["region", "us"]], ["gt", ["dayvolume", 5000000]]], "or")
+  payload = yfs.create_payload("equity", query, top_operator = "or")
+
+  assert [operand["operator"] for operand in payload["query"]["operands"]] == ["or", "or"]
+
+  payload = yfs.create_payload(query = {"operator": "and", "operands": expected["operands"][::-1]})
+
+  assert yfs.Payload.hash(payload) == yfs.Payload.hash(yfs.create_payload(query = expected))
+
+class ShardHandle(Handle):
+
+  # serves the quotes whose market capitalization is in the range of the last condition
+  # in descending order of market capitalization
+  def post(self, url, params = None, json = None, headers = None):
+
+    condition = json["query"]["operands"][-1]["operands"][0]
+    operator, values = condition["operator"], condition["operands"][1:]
+
+    quotes = []
+
+    for i in reversed(range(self.n)):
+
+      value = i * 1e8
+
+      if ((operator == "lt") and (value < values[0])) or \
+         ((operator == "gt") and (value > values[0])) or \
+         ((operator == "btwn") and (values[0] <= value <= values[1])):
+        quotes.append({"symbol": "S" + str(i), "marketCap": {"raw": value, "fmt": str(i)}})
+
+    quotes = quotes[json["offset"]:json["offset"] + json["size"]]
+
+    return Response({"finance": {"result": [{"quotes": quotes}]}})
+
+def test_shard(): # valid 'shard'
+
+  payload = yfs.create_payload(size = 1000)
+
+  payloads = yfs.Payload.shard(payload, "intradaymarketcap", [1e9, 1e10])
+  operators = [shard["query"]["operands"][-1]["operands"][0]["operator"] for shard in payloads]
+
+  assert operators == ["lt", "btwn", "gt"]
+
+  # every shard returns the same rows in the offline session
+  result = yfs.get_data(payload = payload, session = get_session(620), workers = 4,
+                        shard = ("intradaymarketcap", [1e9, 1e10]))
+
+  assert list(result["symbol"]) == ["S" + str(i) for i in range(620)]
+
+  # rows of all shards are sorted by the sort field and cut to the size
+  session = {"handle": ShardHandle(620), "crumb": "crumb", "cookies": {}}
+  payload = yfs.create_payload(size = 100, offset = 10)
+
+  result = yfs.get_data(payload = payload, session = session, workers = 4,
+                        shard = ("intradaymarketcap", [1e9, 1e10]))
+
+  assert list(result["symbol"]) == ["S" + str(i) for i in range(609, 509, -1)]
+
+  # numeric fields other than market capitalization require values
+  with pytest.raises(ValueError):
+    yfs.Payload.shard(payload, "dayvolume")
+
+def test_compact(): # valid 'df'
+
+  df = pd.DataFrame({
+    "symbol": ["AAPL", "MSFT", "AMZN", "NVDA"],
+    "exchange": ["NMS", "NMS", "NMS", "NMS"],
+    "beta.raw": [1.2, 0.9, 1.1, 1.7],
+    "beta.fmt": ["1.20", "0.90", "1.10", "1.70"],
+    "marketCap.raw": [3, 2, 2, 3],
+    "marketCap.fmt": ["3T", "2T", "2T", "3T"],
+    "marketCap.longFmt": ["3,000", "2,000", "2,000", "3,000"]
+  })
+
+  result = Process.compact(df, "equity")
+
+  expected = pd.DataFrame({
+    "symbol": ["AAPL", "MSFT", "AMZN", "NVDA"],
+    "exchange": pd.Categorical(["NMS", "NMS", "NMS", "NMS"]),
+    "beta": [1.2, 0.9, 1.1, 1.7],
+    "marketCap": [3, 2, 2, 3]
+  })
+
+  pd.testing.assert_frame_equal(result, expected)
+
+  # quote keys are matched to the numeric fields of the filters data
+  df = pd.DataFrame({"regularMarketVolume": ["100", "n/a"], "quoteType": ["1", "2"]})
+
+  result = Process.compact(df, "equity")
+
+  assert result["regularMarketVolume"].tolist()[0] == 100
+  assert result["regularMarketVolume"].isna().tolist()[1]
+  assert result["quoteType"].tolist() == ["1", "2"]
+
+  # each page is compacted once and a table cannot be compacted
+  result = yfs.get_data(payload = yfs.create_payload(size = 1000), session = get_session(620),
+                        compact = True)
+
+  assert list(result.columns) == ["symbol", "price"]
+
+  with pytest.raises(ValueError):
+    yfs.get_data(compact = True, output = "arrow")
+
+def test_arrow(tmp_path): # valid 'output'
+
+  pytest.importorskip("pyarrow")
+
+  import pyarrow.parquet as pq
+
+  payload = yfs.create_payload(size = 1000)
+
+  result = yfs.get_data(payload = payload, session = get_session(620), workers = 2, output = "arrow")
+  expected = yfs.get_data(payload = payload, session = get_session(620))
+
+  pd.testing.assert_frame_equal(result.to_pandas(), expected)
+
+  path = str(tmp_path / "data.parquet")
+  count = yfs.write_parquet(path, payload = payload, session = get_session(620))
+
+  assert count == 620
+  assert pq.ParquetFile(path).num_row_groups == 3
+
+  pd.testing.assert_frame_equal(pq.read_table(path).to_pandas(), expected)
+
+class MixedHandle(Handle):
+
+  # whole numbers and a field that is always null on the first page, and decimals
+  # and strings on later pages
+  def post(self, url, params = None, json = None, headers = None):
+
+    result = super().post(url, params, json, headers)
+
+    for quote in result.result["finance"]["result"][0]["quotes"]:
+
+      i = int(quote["symbol"][1:])
+
+      if (json["offset"] == 0):
+        quote["price"]["raw"], quote["name"] = i, None
+      else:
+        quote["price"]["raw"], quote["name"] = i + 0.5, "N" + str(i)
+
+    return Response(result.result)
+
+def test_types(tmp_path): # valid 'output' with different types on each page
+
+  pytest.importorskip("pyarrow")
+
+  import pyarrow.parquet as pq
+
+  payload = yfs.create_payload(size = 1000)
+  session = {"handle": MixedHandle(620), "crumb": "crumb", "cookies": {}}
+
+  result = yfs.get_data(payload = payload, session = session, output = "arrow").to_pandas()
+  expected = yfs.get_data(payload = payload, session = session)
+
+  assert result["price.raw"].tolist() == [float(i) for i in range(250)] + [i + 0.5 for i in range(250, 620)]
+  assert result["name"].isna().tolist() == expected["name"].isna().tolist()
+  assert result["name"].tolist()[250:] == expected["name"].tolist()[250:]
+
+  path = str(tmp_path / "data.parquet")
+  count = yfs.write_parquet(path, payload = payload, session = session)
+
+  result = pq.read_table(path).to_pandas()
+
+  assert count == 620
+  assert result["price.raw"].tolist() == expected["price.raw"].tolist()
+  assert result["name"].isna().sum() == 250
+  assert result["name"].tolist()[250] == "N250"
+
+  # a field with different types in the rows of a page is stored as strings
+  result = Process.table([{"symbol": "A", "x": 1}, {"symbol": "B", "x": "n/a"}, {"symbol": "C"}])
+
+  assert result.column("x").to_pylist() == ["1", "n/a", None]
+
+def test_frame(): # valid 'quotes'
+
+  test_quotes = [
+    [{}],
+    [{"symbol": "AAPL", "price": {"raw": 1.5, "fmt": "1.50"}}, {"symbol": "MSFT"}],
+    [{"a": None, "b": {"c": {"d": 1}}, "e": []}, {"b": {}, "f": True, "a": "x"}]
+  ]
+
+  for quotes in test_quotes:
+
+    result = Process.frame(Process.loads(json.dumps(quotes)))
+
+    pd.testing.assert_frame_equal(result, pd.json_normalize(quotes))
+
+def test_snapshot(tmp_path): # valid 'payload'
+
+  snapshot = yfs.Snapshot(str(tmp_path))
+  payload = yfs.create_payload(size = 1000)
+
+  result = snapshot.get(payload = payload, session = get_session(5))
+
+  assert list(result["change"]) == ["entered"] * 5
+
+  result = snapshot.get(payload = payload, session = get_session(3))
+
+  assert list(result["symbol"]) == ["S3", "S4"]
+  assert list(result["change"]) == ["exited", "exited"]
+
+  old_df = pd.DataFrame({"price": [1.0, 2.0, None]}, index = pd.Index(["A", "B", "C"], name = "symbol"))
+  new_df = pd.DataFrame({"price": [1.0, 3.0, None]}, index = pd.Index(["A", "B", "C"], name = "symbol"))
+
+  result = yfs.Snapshot.diff(old_df, new_df)
+
+  expected = pd.DataFrame({
+    "symbol": ["B"],
+    "change": ["changed"],
+    "price": [3.0]
+  })
+
+  pd.testing.assert_frame_equal(result, expected)
@@ -1,20 +1,37 @@
-from .screen import Data, Query, Payload, Session
-
 __version__ = "0.1.3"
 
-data_filters = Data.filters
-data_categoryname = Data.categoryname
-data_exchange = Data.exchange
-data_fundfamilyname = Data.fundfamilyname
-data_industry = Data.industry
-data_peer_group = Data.peer_group
-data_region = Data.region
-data_sector = Data.sector
-data_errors = Data.errors
-create_query = Query.create
-create_payload = Payload.create
-get_session = Session.get
-get_data = Data.get
+# names are resolved on first use so that 'import yfscreen' does not import
+# pandas and requests or read the data files
+_attrs = {
+  "Data": ("Data", None),
+  "data_filters": ("Data", "filters"),
+  "data_categoryname": ("Data", "categoryname"),
+  "data_exchange": ("Data", "exchange"),
+  "data_fundfamilyname": ("Data", "fundfamilyname"),
+  "data_industry": ("Data", "industry"),
+  "data_peer_group": ("Data", "peer_group"),
+  "data_region": ("Data", "region"),
+  "data_sector": ("Data", "sector"),
+  "data_errors": ("Data", "errors"),
+  "Query": ("Query", None),
+  "create_query": ("Query", "create"),
+  "Payload": ("Payload", None),
+  "create_payload": ("Payload", "create"),
+  "Session": ("Session", None),
+  "get_session": ("Session", "get"),
+  "Limiter": ("Limiter", None),
+  "get_limiter": ("Limiter", "get"),
+  "set_limiter": ("Limiter", "set"),
+  "Retry": ("Retry", None),
+  "Stats": ("Stats", None),
+  "Tuner": ("Tuner", None),
+  "Cache": ("Cache", None),
+  "Snapshot": ("Snapshot", None),
+  "get_data": ("Data", "get"),
+  "iter_data": ("Data", "pages"),
+  "get_data_batch": ("Data", "batch"),
+  "write_parquet": ("Data", "write")
+}
 
 __all__ = [
     "Data", "data_filters", "data_categoryname", "data_exchange", "data_fundfamilyname",
@@ -22,5 +39,27 @@ __all__ = [
     "Query", "create_query",
     "Payload", "create_payload",
     "Session", "get_session",
-    "get_data"
+    "Limiter", "get_limiter", "set_limiter", "Retry", "Stats", "Tuner",
+    "Cache", "Snapshot",
+    "get_data", "iter_data", "get_data_batch", "write_parquet"
 ]
+
+def __getattr__(name):
+
+  if (name not in _attrs):
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+  from . import screen
+
+  cls, attr = _attrs[name]
+  result = getattr(screen, cls)
+
+  if attr is not None:
+    result = getattr(result, attr)
+
+  globals()[name] = result
+
+  return result
+
+def __dir__():
+  return sorted(set(globals()).union(__all__))
@@ -0,0 +1,309 @@
+import asyncio
+import collections
+import aiohttp
+import pandas as pd
+from .screen import Api, Check, Limiter, Page, Payload, Process, Retry
+
+async def acquire(limiter):
+
+  if limiter is not None:
+
+    result = limiter.reserve()
+
+    if (result > 0):
+      await asyncio.sleep(result)
+
+async def get_session(limiter = None):
+  """
+  Get the Crumb, Cookies, and Handle for the Yahoo Finance API Asynchronously
+
+  A coroutine to get the crumb, cookies, and handle required to authenticate and interact
+  with the Yahoo Finance API. The handle should be closed when it is no longer needed.
+
+  Parameters:
+    limiter (Limiter): rate limiter for the request. When a limiter is not
+      provided, the process-wide limiter is used.
+
+  Returns:
+    A dictionary containing the following elements:
+      - "handle" (aiohttp.ClientSession): a session handle object for subsequent requests.
+      - "crumb" (str): a string representing the crumb value for authentication.
+      - "cookies" (dict): a dictionary of cookies for the request.
+
+  Examples:
+    session = await yfs.aio.get_session()
+
+    await session["handle"].close()
+  """
+
+  headers = {
+    "Accept": Api.accept,
+    "User-Agent": Api.user_agent,
+  }
+
+  session = aiohttp.ClientSession(headers = headers)
+
+  result = {
+    "handle": session,
+    "crumb": None,
+    "cookies": {}
+  }
+
+  await refresh(result, limiter = limiter)
+
+  return result
+
+async def refresh(session, crumb = None, limiter = None, lock = None):
+  """
+  Refresh the Crumb and Cookies for the Yahoo Finance API Asynchronously
+
+  A coroutine to get a new crumb and cookies for an existing session, reusing its
+  handle and connections. The session is updated in place.
+
+  Parameters:
+    session (dict): session created using the `get_session` coroutine.
+    crumb (str): crumb that was rejected. When the crumb of the session has
+      already changed, e.g., in another task, the session is not refreshed again.
+    limiter (Limiter): rate limiter for the request. When a limiter is not
+      provided, the process-wide limiter is used.
+    lock (asyncio.Lock): lock shared by the tasks that use the session so that
+      one new crumb is requested for the same rejected crumb.
+
+  Returns:
+    The updated session.
+
+  Examples:
+    session = await yfs.aio.get_session()
+
+    session = await yfs.aio.refresh(session)
+  """
+
+  if lock is None:
+    lock = asyncio.Lock()
+
+  async with lock:
+
+    if (crumb is None) or (session["crumb"] == crumb):
+
+      handle = session["handle"]
+
+      if limiter is None:
+        limiter = Limiter.get()
+
+      await acquire(limiter)
+
+      async with handle.get(Api.crumb_url) as response:
+        session["crumb"] = (await response.text()).strip()
+
+      session["cookies"] = {cookie.key: cookie.value for cookie in handle.cookie_jar}
+
+  return session
+
+async def get_page(session, headers, payload, offset, size, limiter, semaphore, retry,
+                   lock):
+
+  handle = session["handle"]
+  payload = dict(payload, offset = offset, size = size)
+
+  result = None
+
+  async with semaphore:
+
+    for attempt in range(retry.attempts):
+
+      if (attempt > 0):
+
+        if (response is None) or (response.status != 401):
+          await asyncio.sleep(retry.delay(attempt - 1, response))
+
+      crumb = session["crumb"]
+
+      await acquire(limiter)
+
+      response = None
+
+      try:
+
+        async with handle.post(Api.screener_url, params = Api.params(crumb), json = payload,
+                               headers = headers) as response:
+
+          if (response.status == 200):
+            result = Process.loads(await response.read())
+
+        if (response.status == 401):
+
+          # the crumb was rejected so get a new crumb before the next attempt
+          await refresh(session, crumb, limiter, lock)
+
+          continue
+
+        if (response.status != 200):
+
+          if not Retry.retryable(response.status):
+            break
+
+          continue
+
+        result = result["finance"]["result"][0].get("quotes", [])
+        break
+
+      except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError, IndexError,
+              TypeError):
+        result = None
+
+  # a page that failed after all attempts is reported instead of treated as empty
+  if result is None:
+    return None
+
+  result_df = Process.page(result)
+
+  return result_df
+
+async def get_data(payload = None, session = None, workers = 1, limiter = None,
+                   semaphore = None, retry = None):
+  """
+  Get Data from the Yahoo Finance API Asynchronously
+
+  A coroutine to get data from the Yahoo Finance API using the specified payload.
+
+  Parameters:
+    payload (dict): payload that contains search criteria created using
+      the `create_query` and `create_payload` methods.
+    session (dict): session created using the `get_session` coroutine. When a
+      session is not provided, a session is created and closed internally.
+    workers (int): maximum number of pages to request concurrently.
+    limiter (Limiter): rate limiter for the requests. When a limiter is not
+      provided, the process-wide limiter is used.
+    semaphore (asyncio.Semaphore): semaphore to limit the number of requests in
+      flight across calls. When a semaphore is not provided, only `workers`
+      limits the requests.
+    retry (Retry): retry policy for failed requests. When a policy is not
+      provided, the default `Retry` policy is used. A rejected crumb is
+      refreshed before the next attempt.
+
+  Returns:
+    A data frame that contains data from the Yahoo Finance API for the
+    specified search criteria. The "failed" key of its `attrs` is a list with
+    a payload for each window of rows that failed after all attempts.
+
+  Examples:
+    query = yfs.create_query(["eq", ["region", "us"]])
+
+    payload = yfs.create_payload("equity", query, size = 1000)
+
+    session = await yfs.aio.get_session()
+
+    data = await yfs.aio.get_data(payload, session, workers = 4)
+
+    await session["handle"].close()
+  """
+
+  Check.workers(workers)
+
+  if payload is None:
+    payload = Payload.create()
+
+  if limiter is None:
+    limiter = Limiter.get()
+
+  if semaphore is None:
+    semaphore = asyncio.Semaphore(workers)
+
+  if retry is None:
+    retry = Retry()
+
+  close = session is None
+
+  if session is None:
+    session = await get_session(limiter)
+
+  handle = session["handle"]
+  lock = asyncio.Lock()
+
+  headers = {
+    "User-Agent": Api.user_agent
+  }
+
+  handle.cookie_jar.update_cookies(session["cookies"])
+
+  max_size = 250
+  end = payload["offset"] + payload["size"]
+  windows = Process.windows(payload["offset"], payload["size"], max_size)
+
+  result_ls = []
+  pending = collections.deque()
+  errors = []
+
+  def submit():
+
+    window = next(windows, None)
+
+    if window is not None:
+
+      offset, chunk_size = window
+      task = asyncio.ensure_future(get_page(session, headers, payload, offset, chunk_size,
+                                            limiter, semaphore, retry, lock))
+
+      pending.append((offset, chunk_size, task))
+
+  def stop():
+
+    for _, _, task in pending:
+      task.cancel()
+
+    pending.clear()
+
+  try:
+
+    # at most 'workers' windows are in flight and results are consumed in order
+    for i in range(workers):
+      submit()
+
+    while (len(pending) > 0):
+
+      offset, chunk_size, task = pending.popleft()
+      result_df = await task
+
+      if result_df is None:
+
+        errors.append((offset, chunk_size))
+
+        # stop after as many failed windows as workers and report the rest as failed
+        if (len(errors) >= workers):
+
+          window = pending[0][:2] if (len(pending) > 0) else next(windows, None)
+
+          if window is not None:
+            errors.append((window[0], end - window[0]))
+
+          stop()
+
+        else:
+          submit()
+
+        continue
+
+      if (len(result_df) > 0):
+        result_ls.append(result_df)
+
+      # a short or empty page is the last page
+      if (len(result_df) < chunk_size):
+        stop()
+      else:
+        submit()
+
+  finally:
+
+    stop()
+
+    if close:
+      await handle.close()
+
+  if (len(result_ls) == 0):
+    result = pd.DataFrame()
+  else:
+    result = Process.align(result_ls)
+
+  result.attrs["failed"] = Page.failed(payload, errors)
+
+  return result
@@ -0,0 +1,170 @@
+import os
+import sys
+import argparse
+
+def value(x):
+
+  for cast in [int, float]:
+    try:
+      return cast(x)
+    except ValueError:
+      pass
+
+  return x
+
+def parser():
+
+  result = argparse.ArgumentParser(
+    prog = "yfscreen",
+    description = "Get data from the Yahoo Finance screener API and write each page " +
+      "as it arrives."
+  )
+
+  result.add_argument("-f", "--filter", nargs = "+", action = "append", dest = "filters",
+                      metavar = "VALUE",
+                      help = "filter as a comparison, a field, and its value(s) " +
+                        "(e.g., -f eq region us -f gt dayvolume 5000000); " +
+                        "default: eq region us")
+  result.add_argument("--top-operator", default = "and", choices = ["and", "or"],
+                      help = "operator to combine the filters (default: %(default)s)")
+  result.add_argument("-t", "--sec-type", default = "equity",
+                      help = "security type (i.e., equity, mutualfund, etf, index, future) " +
+                        "(default: %(default)s)")
+  result.add_argument("-n", "--size", type = int, default = 25,
+                      help = "number of rows (default: %(default)s)")
+  result.add_argument("--offset", type = int, default = 0,
+                      help = "offset of the first row (default: %(default)s)")
+  result.add_argument("-s", "--sort-field",
+                      help = "field to sort the rows (default: depends on the security type)")
+  result.add_argument("--sort-type", choices = ["asc", "desc"],
+                      help = "direction to sort the rows")
+  result.add_argument("-c", "--columns",
+                      help = "comma-separated columns to keep from each quote " +
+                        "(e.g., symbol,regularMarketPrice.raw)")
+  result.add_argument("--compact", action = "store_true",
+                      help = "keep only the raw value of formatted fields (not for parquet)")
+  result.add_argument("--format", default = "csv", choices = ["csv", "ndjson", "parquet"],
+                      help = "format of the output (default: %(default)s)")
+  result.add_argument("-o", "--output", default = "-",
+                      help = "path of the output or - for stdout (default: %(default)s)")
+  result.add_argument("-j", "--concurrency", type = int, default = 1,
+                      help = "number of pages to request concurrently (default: %(default)s)")
+  result.add_argument("--rate", type = float, default = 5,
+                      help = "number of requests per second (default: %(default)s)")
+
+  return result
+
+def write(pages, file, format):
+
+  header = None
+
+  for page in pages:
+
+    if (format == "ndjson"):
+      page.to_json(file, orient = "records", lines = True)
+    elif header is None:
+
+      header = list(page.columns)
+      page.to_csv(file, index = False)
+
+    else:
+
+      # columns of later pages follow the columns of the first page
+      page.reindex(columns = header).to_csv(file, index = False, header = False)
+
+    file.flush()
+
+def main(argv = None):
+  """
+  Get Data from the Yahoo Finance API on the Command Line
+
+  A console entry point that creates the query and payload from the arguments and
+  writes each page of data as CSV, NDJSON, or Parquet as soon as it arrives, so that
+  other commands in a pipeline can read the rows before the last page arrives.
+
+  Parameters:
+    argv (list): arguments of the command. When arguments are not provided, the
+      arguments of the process are used.
+
+  Returns:
+    The exit status, which is one when any window of rows failed.
+
+  Examples:
+    yfscreen -f eq region us -f gt dayvolume 5000000 -n 1000 -j 4 > data.csv
+
+    yfscreen -t etf -n 500 --format ndjson | head
+  """
+
+  args = parser().parse_args(argv)
+
+  if any(len(x) < 3 for x in args.filters or []):
+    parser().error("invalid 'filter'")
+
+  # the package is imported after the arguments are parsed so that '--help' is fast
+  from .screen import Check, Limiter, Query, Payload, pages, write as write_parquet
+
+  filters = [[x[0], [x[1]] + [value(y) for y in x[2:]]] for x in args.filters or []]
+  columns = args.columns.split(",") if (args.columns is not None) else None
+  failed = []
+
+  # only errors of the arguments are usage errors and errors of the download are raised
+  try:
+
+    if (len(filters) > 0):
+      query = Query.create(filters, args.top_operator)
+    else:
+      query = Query.create()
+
+    payload = Payload.create(sec_type = args.sec_type, query = query, size = args.size,
+                             offset = args.offset, sort_field = args.sort_field,
+                             sort_type = args.sort_type, top_operator = args.top_operator)
+    limiter = Limiter(rate = args.rate, burst = max(1, int(args.rate)))
+
+    Check.workers(args.concurrency)
+
+    if columns is not None:
+      Check.columns(columns)
+
+    if (args.format == "parquet"):
+
+      if (args.output == "-"):
+        raise ValueError("'output' must be a path for 'parquet'")
+
+      # compact columns are only available for data frames
+      if args.compact:
+        raise ValueError("'compact' is not supported for 'parquet'")
+
+  except ValueError as e:
+    parser().error(str(e))
+
+  try:
+
+    if (args.format == "parquet"):
+      write_parquet(args.output, payload, workers = args.concurrency, limiter = limiter,
+                    failed = failed, columns = columns)
+    else:
+
+      result = pages(payload, workers = args.concurrency, limiter = limiter,
+                     compact = args.compact, failed = failed, columns = columns)
+
+      if (args.output == "-"):
+        write(result, sys.stdout, args.format)
+      else:
+        with open(args.output, "w", newline = "") as file:
+          write(result, file, args.format)
+
+  except BrokenPipeError:
+
+    # the reader of the pipeline exited (e.g., 'head') before the last page
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+    return 0
+
+  if (len(failed) > 0):
+
+    windows = ", ".join(f"{x['offset']}-{x['offset'] + x['size']}" for x in failed)
+    print(f"yfscreen: failed to get rows {windows}", file = sys.stderr)
+
+    return 1
+
+  return 0
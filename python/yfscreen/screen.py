@@ -1,10 +1,28 @@
 import os
+import json
 import time
+import random
+import email.utils
+import pickle
+import hashlib
+import tempfile
+import itertools
+import threading
+import multiprocessing
+import collections
+import concurrent.futures
 import requests
+import requests.adapters
+import numpy as np
 import pandas as pd
 import importlib.resources as pkg_resources
 import contextlib
 
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
 class ClassProperty:
 
   def __init__(self, getter):
@@ -24,6 +42,38 @@ class Data:
   _region = None
   _sector = None
   _errors = None
+  _arrays = {}
+  _index = None
+  _sectors = None
+
+  # keys in the quotes of the response for fields in the filters data (e.g., the
+  # "marketCap" key for the "intradaymarketcap" field)
+  keys = {
+    "ticker": "symbol",
+    "intradaymarketcap": "marketCap",
+    "lastclosemarketcap.lasttwelvemonths": "marketCap",
+    "intradayprice": "regularMarketPrice",
+    "intradaypricechange": "regularMarketChange",
+    "percentchange": "regularMarketChangePercent",
+    "dayvolume": "regularMarketVolume",
+    "eodvolume": "regularMarketVolume",
+    "avgdailyvol3m": "averageDailyVolume3Month",
+    "fiftytwowkpercentchange": "fiftyTwoWeekChangePercent",
+    "fiftydaymovingavg": "fiftyDayAverage",
+    "twohundreddaymovingavg": "twoHundredDayAverage",
+    "peratio.lasttwelvemonths": "trailingPE",
+    "bookvalueshare.lasttwelvemonths": "bookValue",
+    "lastclosepricebookvalue.lasttwelvemonths": "priceToBook",
+    "totalsharesoutstanding": "sharesOutstanding",
+    "fundnetassets": "netAssets",
+    "annualreportnetexpenseratio": "netExpenseRatio",
+    "region": "region",
+    "exchange": "exchange",
+    "sector": "sector",
+    "industry": "industry",
+    "beta": "beta",
+    "dividendyield": "dividendYield"
+  }
 
   @ClassProperty
   def filters(cls):
@@ -37,8 +87,7 @@ class Data:
     """
 
     if cls._filters is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "filters.csv"
-      cls._filters = pd.read_csv(data_path)
+      cls._filters = Data.frame("filters")
 
     return cls._filters
 
@@ -54,8 +103,7 @@ class Data:
     """
 
     if cls._categoryname is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "categoryname.csv"
-      cls._categoryname = pd.read_csv(data_path)
+      cls._categoryname = Data.frame("categoryname")
 
     return cls._categoryname
 
@@ -71,8 +119,7 @@ class Data:
     """
 
     if cls._exchange is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "exchange.csv"
-      cls._exchange = pd.read_csv(data_path)
+      cls._exchange = Data.frame("exchange")
 
     return cls._exchange
 
@@ -88,8 +135,7 @@ class Data:
     """
 
     if cls._fundfamilyname is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "fundfamilyname.csv"
-      cls._fundfamilyname = pd.read_csv(data_path)
+      cls._fundfamilyname = Data.frame("fundfamilyname")
 
     return cls._fundfamilyname
 
@@ -105,8 +151,7 @@ class Data:
     """
 
     if cls._industry is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "industry.csv"
-      cls._industry = pd.read_csv(data_path)
+      cls._industry = Data.frame("industry")
 
     return cls._industry
 
@@ -122,8 +167,7 @@ class Data:
     """
 
     if cls._peer_group is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "peer_group.csv"
-      cls._peer_group = pd.read_csv(data_path)
+      cls._peer_group = Data.frame("peer_group")
 
     return cls._peer_group
 
@@ -139,8 +183,7 @@ class Data:
     """
 
     if cls._region is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "region.csv"
-      cls._region = pd.read_csv(data_path)
+      cls._region = Data.frame("region")
 
     return cls._region
 
@@ -156,8 +199,7 @@ class Data:
     """
 
     if cls._sector is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "sector.csv"
-      cls._sector = pd.read_csv(data_path)
+      cls._sector = Data.frame("sector")
 
     return cls._sector
 
@@ -173,14 +215,166 @@ class Data:
     """
 
     if cls._errors is None:
-      data_path = pkg_resources.files("yfscreen") / "data" / "errors.csv"
-      cls._errors = pd.read_csv(data_path)
+      cls._errors = Data.frame("errors")
       cls._errors = cls._errors.where(pd.notna(cls._errors), None)
 
     return cls._errors
 
+  @staticmethod
+  def array(name):
+
+    if (name not in Data._arrays):
+
+      data_path = pkg_resources.files("yfscreen") / "data" / (name + ".npy")
+
+      # the prebuilt file is memory-mapped so that processes share its pages
+      try:
+        with pkg_resources.as_file(data_path) as file:
+          result = np.load(file, mmap_mode = "r", allow_pickle = False)
+      except (OSError, ValueError):
+        result = Data.build(name)
+
+      Data._arrays[name] = result
+
+    return Data._arrays[name]
+
+  @staticmethod
+  def build(name):
+
+    data_path = pkg_resources.files("yfscreen") / "data" / (name + ".csv")
+    data_df = pd.read_csv(data_path, dtype = str, keep_default_na = False,
+                          na_values = ["", "NA"])
+
+    # missing values are stored as empty strings and each string as utf-8 bytes
+    data_ls = {col: [value.encode("utf-8") for value in data_df[col].fillna("")]
+               for col in data_df.columns}
+
+    dtype = [(col, "S" + str(max([1] + [len(value) for value in values])))
+             for col, values in data_ls.items()]
+
+    result = np.empty(len(data_df), dtype = dtype)
+
+    for col, values in data_ls.items():
+      result[col] = values
+
+    return result
+
+  @staticmethod
+  def values(name, col):
+
+    result = [value.decode("utf-8") for value in Data.array(name)[col].tolist()]
+
+    return result
+
+  @staticmethod
+  def frame(name):
+
+    data = Data.array(name)
+
+    result = pd.DataFrame({col: Data.values(name, col) for col in data.dtype.names})
+    result = result.replace("", float("nan"))
+
+    return result
+
+  @staticmethod
+  def fields(sec_type):
+    """
+    Get the Fields of a Security Type
+
+    A method to get the fields in the filters data for the specified security type.
+
+    Parameters:
+      sec_type (str): security type (i.e., "equity", "mutualfund", "etf",
+        "index", "future").
+
+    Returns:
+      A list of fields.
+
+    Examples:
+      fields = yfs.Data.fields("equity")
+    """
+
+    if Data._index is None:
+
+      result = {}
+
+      for sec_type_i, field in zip(Data.values("filters", "sec_type"),
+                                   Data.values("filters", "field")):
+        result.setdefault(sec_type_i, []).append(field)
+
+      Data._index = result
+
+    result = list(Data._index.get(sec_type, []))
+
+    return result
+
+  @staticmethod
+  def sector_of(industry):
+    """
+    Get the Sector of an Industry
+
+    A method to get the sector of the specified industry in the industry data.
+
+    Parameters:
+      industry (str): industry (e.g., "Semiconductors").
+
+    Returns:
+      The sector or None when the industry is not in the data.
+
+    Examples:
+      sector = yfs.Data.sector_of("Semiconductors")
+    """
+
+    if Data._sectors is None:
+      Data._sectors = dict(zip(Data.values("industry", "value"),
+                               Data.values("industry", "sector")))
+
+    result = Data._sectors.get(industry)
+
+    return result
+
 class Check:
 
+  _index = None
+
+  @ClassProperty
+  def index(cls):
+
+    if cls._index is None:
+
+      result = {}
+
+      filters = [Data.values("filters", col) for col in ["sec_type", "field", "python", "unit"]]
+      errors = [Data.values("errors", col) for col in ["sec_type", "field", "sort_field"]]
+
+      for sec_type, field, python, unit in zip(*filters):
+
+        if (sec_type not in result):
+          result[sec_type] = {"fields": set(), "sort_fields": set(), "types": {}, "units": {}}
+
+        result[sec_type]["fields"].add(field)
+        result[sec_type]["sort_fields"].add(field)
+        result[sec_type]["types"][field] = python
+
+        if (len(unit) > 0):
+          result[sec_type]["units"][field] = unit
+
+      for sec_type, field, sort_field in zip(*errors):
+
+        if (sec_type in result):
+
+          result[sec_type]["fields"].discard(field)
+          result[sec_type]["sort_fields"].discard(sort_field)
+
+      for value in result.values():
+
+        value["fields"] = frozenset(value["fields"])
+        value["sort_fields"] = frozenset(value["sort_fields"])
+
+      cls._index = result
+
+    return cls._index
+
   @staticmethod
   def filters(filters):
 
@@ -219,6 +413,133 @@ class Check:
     if (offset < 0):
       raise ValueError("value of 'offset' must be greater than or equal to zero")
 
+  @staticmethod
+  def workers(workers):
+
+    valid_workers = isinstance(workers, int) and not isinstance(workers, bool)
+
+    if not valid_workers:
+      raise ValueError("invalid 'workers'")
+
+    if (workers < 1):
+      raise ValueError("value of 'workers' must be greater than or equal to one")
+
+  @staticmethod
+  def slowdown(slowdown):
+
+    valid_slowdown = isinstance(slowdown, (int, float)) and not isinstance(slowdown, bool)
+
+    if not valid_slowdown:
+      raise ValueError("invalid 'slowdown'")
+
+    if (slowdown <= 1):
+      raise ValueError("value of 'slowdown' must be greater than one")
+
+  @staticmethod
+  def processes(processes):
+
+    valid_processes = isinstance(processes, int) and not isinstance(processes, bool)
+
+    if not valid_processes:
+      raise ValueError("invalid 'processes'")
+
+    if (processes < 1):
+      raise ValueError("value of 'processes' must be greater than or equal to one")
+
+  @staticmethod
+  def rate(rate):
+
+    valid_rate = isinstance(rate, (int, float)) and not isinstance(rate, bool)
+
+    if not valid_rate:
+      raise ValueError("invalid 'rate'")
+
+    if (rate <= 0):
+      raise ValueError("value of 'rate' must be greater than zero")
+
+  @staticmethod
+  def burst(burst):
+
+    valid_burst = isinstance(burst, int) and not isinstance(burst, bool)
+
+    if not valid_burst:
+      raise ValueError("invalid 'burst'")
+
+    if (burst < 1):
+      raise ValueError("value of 'burst' must be greater than or equal to one")
+
+  @staticmethod
+  def attempts(attempts):
+
+    valid_attempts = isinstance(attempts, int) and not isinstance(attempts, bool)
+
+    if not valid_attempts:
+      raise ValueError("invalid 'attempts'")
+
+    if (attempts < 1):
+      raise ValueError("value of 'attempts' must be greater than or equal to one")
+
+  @staticmethod
+  def backoff(backoff):
+
+    valid_backoff = isinstance(backoff, (int, float)) and not isinstance(backoff, bool)
+
+    if not valid_backoff:
+      raise ValueError("invalid 'backoff'")
+
+    if (backoff < 0):
+      raise ValueError("value of 'backoff' must be greater than or equal to zero")
+
+  @staticmethod
+  def pool_size(pool_size):
+
+    valid_pool_size = isinstance(pool_size, int) and not isinstance(pool_size, bool)
+
+    if not valid_pool_size:
+      raise ValueError("invalid 'pool_size'")
+
+    if (pool_size < 1):
+      raise ValueError("value of 'pool_size' must be greater than or equal to one")
+
+  @staticmethod
+  def ttl(ttl):
+
+    valid_ttl = isinstance(ttl, (int, float)) and not isinstance(ttl, bool)
+
+    if not valid_ttl:
+      raise ValueError("invalid 'ttl'")
+
+    if (ttl < 0):
+      raise ValueError("value of 'ttl' must be greater than or equal to zero")
+
+  @staticmethod
+  def max_bytes(max_bytes):
+
+    valid_max_bytes = isinstance(max_bytes, int) and not isinstance(max_bytes, bool)
+
+    if not valid_max_bytes:
+      raise ValueError("invalid 'max_bytes'")
+
+    if (max_bytes < 0):
+      raise ValueError("value of 'max_bytes' must be greater than or equal to zero")
+
+  @staticmethod
+  def columns(columns):
+
+    valid_columns = (isinstance(columns, (list, tuple)) and (len(columns) > 0) and
+      all(isinstance(x, str) and (x.strip() != "") for x in columns))
+
+    if not valid_columns:
+      raise ValueError("invalid 'columns'")
+
+  @staticmethod
+  def output(output):
+
+    valid_output = ["pandas", "arrow"]
+
+    if (output not in valid_output):
+      raise ValueError("invalid 'output'")
+
   @staticmethod
   def sort_type(sort_type):
 
@@ -238,23 +559,26 @@ class Check:
   @staticmethod
   def sec_type(sec_type):
 
-    valid_sec_type = Data.filters["sec_type"].unique()
+    valid_sec_type = isinstance(sec_type, str) and (sec_type in Check.index)
 
-    if (sec_type not in valid_sec_type):
+    if not valid_sec_type:
       raise ValueError("invalid 'sec_type'")
 
   @staticmethod
   def fields(sec_type, query):
 
-    valid_fields = set(Data.filters.loc[Data.filters["sec_type"] == sec_type, "field"])
-    error_fields = set(Data.errors.loc[Data.errors["sec_type"] == sec_type, "field"])
-    valid_fields = valid_fields.difference(error_fields)
+    valid_fields = Check.index[sec_type]["fields"]
 
     fields = []
 
     for operand in query["operands"]:
-      if isinstance(operand["operands"], list) and (len(operand["operands"]) > 0):
-        fields.append(operand["operands"][0]["operands"][0])
+
+      # operands are groups of conditions by field or conditions alone
+      while (operand["operator"] in ["and", "or"]) and (len(operand["operands"]) > 0):
+        operand = operand["operands"][0]
+
+      if (operand["operator"] not in ["and", "or"]) and (len(operand["operands"]) > 0):
+        fields.append(operand["operands"][0])
 
     invalid_fields = set(fields).difference(valid_fields)
 
@@ -264,9 +588,7 @@ class Check:
   @staticmethod
   def sort_field(sec_type, sort_field):
 
-    valid_sort_fields = set(Data.filters.loc[Data.filters["sec_type"] == sec_type, "field"])
-    error_sort_fields = set(Data.errors.loc[Data.errors["sec_type"] == sec_type, "sort_field"])
-    valid_sort_fields = valid_sort_fields.difference(error_sort_fields)
+    valid_sort_fields = Check.index[sec_type]["sort_fields"]
 
     if (sort_field not in valid_sort_fields):
       raise ValueError("invalid 'sort_field' for 'sec_type'")
@@ -294,192 +616,855 @@ class Process:
 
     return result_ls
 
+  @staticmethod
+  def flatten(item, prefix = None):
+
+    result = {}
+    nested = []
+
+    # same keys and order as 'pd.json_normalize': top-level values before nested values
+    for key, value in item.items():
+
+      if prefix is not None:
+        key = prefix + "." + key
+
+      if not isinstance(value, dict):
+        result[key] = value
+      elif prefix is None:
+        nested.append((key, value))
+      else:
+        result.update(Process.flatten(value, key))
+
+    for key, value in nested:
+      result.update(Process.flatten(value, key))
+
+    return result
+
   @staticmethod
   def cols(df):
 
-    for col in df.columns:
+    none_cols = []
+    drop_cols = []
+    result_ls = []
 
-      if df[col].apply(lambda x: isinstance(x, list)).all():
+    for col in df.columns:
 
-        status_df = df[col].apply(lambda x: all(isinstance(i, dict) for i in x)).all()
+      if (df[col].dtype != object):
+        continue
 
-        if status_df:
+      values = df[col].tolist()
 
-          cols = set()
+      if not all(isinstance(x, list) for x in values):
+        continue
 
-          for row in df[col]:
-            for item in row:
+      if all(isinstance(i, dict) for x in values for i in x):
 
-              flattened_item = pd.json_normalize(item, sep = ".", max_level = None)
-              cols.update(flattened_item.columns)
+        # union of keys across all items and values of the first item
+        cols = {}
+        rows = []
 
-          row_na = {key: None for key in cols}
+        for row in values:
 
-          result_ls = []
+          for item in row:
+            cols.update(dict.fromkeys(Process.flatten(item)))
 
-          for row in df[col]:
+          if (len(row) == 0):
+            rows.append({})
+          else:
+            rows.append(Process.flatten(row[0]))
 
-            if (len(row) == 0):
-              result_ls.append(row_na)
-            else:
+        cols = list(cols)
 
-              flattened_row = pd.json_normalize(row[0]).to_dict(orient = "records")[0]
-              result = {key: flattened_row.get(key, None) for key in cols}
+        result_df = pd.DataFrame([{key: row.get(key, None) for key in cols} for row in rows],
+                                 columns = cols)
+        result_ls.append(result_df)
 
-              cols_na = cols - result.keys()
+        drop_cols.append(col)
 
-              for col_na in cols_na:
-                result[col_na] = None
+      else:
+        none_cols.append(col)
 
-              result_ls.append(result)
+    if (len(drop_cols) > 0) or (len(none_cols) > 0):
 
-          result_df = pd.DataFrame(result_ls)
-          df = pd.concat([df.reset_index(drop = True), result_df], axis = 1)
+      df = df.drop(columns = drop_cols)
 
-          df.drop(columns = [col], inplace = True)
+      for col in none_cols:
+        df[col] = None
 
-        else:
-          df[col] = None
+    if (len(result_ls) > 0):
+      df = pd.concat([df.reset_index(drop = True)] + result_ls, axis = 1)
 
     return df
 
   @staticmethod
-  def align(dfs):
+  def loads(content):
 
-    # union of columns in order of appearance with missing values filled
-    result = pd.concat(dfs, ignore_index = True)
-
-    return result
+    if orjson is not None:
+      return orjson.loads(content)
 
-class Env:
+    return json.loads(content)
 
   @staticmethod
-  @contextlib.contextmanager
-  def with_(new_env):
+  def fill(cols, item, prefix, i):
 
-    old_env = {}
+    nested = []
 
-    try:
+    for key, value in item.items():
 
-      for name, value in new_env.items():
+      if prefix is not None:
+        key = prefix + "." + key
 
-        old_env[name] = os.environ.get(name)
+      if not isinstance(value, dict):
 
-        if value is None:
-          os.environ.pop(name, None)
-        else:
-          os.environ[name] = value
+        values = cols.get(key)
 
-      yield
+        if values is None:
+          values = cols[key] = []
 
-    finally:
+        # missing values of previous rows
+        if (len(values) < i):
+          values.extend([float("nan")] * (i - len(values)))
 
-      for name, value in old_env.items():
+        values.append(value)
 
-        if value is None:
-          os.environ.pop(name, None)
-        else:
-          os.environ[name] = value
+      elif prefix is None:
+        nested.append((key, value))
+      else:
+        Process.fill(cols, value, key, i)
 
-class Query:
+    for key, value in nested:
+      Process.fill(cols, value, key, i)
 
   @staticmethod
-  def create(filters = ["eq", ["region", "us"]], top_operator = "and"):
-    """
-    Create a Structured Query for the Yahoo Finance API
+  def frame(quotes):
 
-    A method to create a structured query with logical operations and nested conditions
-    formatted for the Yahoo Finance API.
+    # same result as 'pd.json_normalize' but built column by column
+    cols = {}
 
-    Parameters:
-      filters (list): each element is a sublist that defines a filtering condition with
-        the following structure:
-          - "comparison" (str): comparison operator (i.e., "gt", "lt", "eq", "btwn").
-          - "field" (list): field name (e.g., "region") and its associated value(s).
-      top_operator (str): top-level logical operator to combine all filters (i.e., "and", "or").
+    for i, quote in enumerate(quotes):
+      Process.fill(cols, quote, None, i)
 
-    Returns:
-      A nested dictionary representing the structured query with logical operations and
-      nested conditions formatted for the Yahoo Finance API.
+    n = len(quotes)
 
-    Examples:
-      filters = [
-        ["eq", ["region", "us"]],
-        ["btwn", ["intradaymarketcap", 2000000000, 10000000000]],
-        ["btwn", ["intradaymarketcap", 10000000000, 100000000000]],
-        ["gt", ["intradaymarketcap", 100000000000]],
-        ["gt", ["dayvolume", 5000000]]
-      ]
+    for values in cols.values():
+      if (len(values) < n):
+        values.extend([float("nan")] * (n - len(values)))
 
-      query = yfs.create_query(filters)
-    """
+    result = pd.DataFrame(cols, index = pd.RangeIndex(n), columns = list(cols))
 
-    Check.filters(filters)
-    Check.top_operator(top_operator)
+    return result
 
-    result_ls = Process.filters(filters)
-    result = {"operator": top_operator, "operands": []}
+  @staticmethod
+  def page(quotes):
 
-    for key, operands in result_ls.items():
-      result["operands"].append({"operator": "or", "operands": operands})
+    if (len(quotes) == 0):
+      return pd.DataFrame()
 
-    return result
+    result = Process.frame(quotes)
+    result = Process.cols(result)
 
-class Payload:
+    return result
 
   @staticmethod
-  def create(sec_type = "equity", query = None,
-             size = 25, offset = 0,
-             sort_field = None, sort_type = None,
-             top_operator = "and"):
-    """
-    Create a Payload for the Yahoo Finance API
+  def prune(quotes, columns):
 
-    A method to create a payload to query the Yahoo Finance API with customizable parameters.
+    # a nested column (e.g., "regularMarketPrice.raw") keeps its top-level key
+    keys = list(dict.fromkeys(col.split(".")[0] for col in columns))
 
-    Parameters:
-      sec_type (str): type of security to search
-        (i.e., "equity", "mutualfund", "etf", "index", "future").
-      query (list or tuple): structured query to filter results created by
-        the `create_query` method.
-      size (int): number of results to return.
-      offset (int): starting position of the results.
-      sort_field (str): field to sort the results.
-      sort_type (str): type of sort to apply (i.e., "asc", "desc").
-      top_operator (str): logical operator for the top-level of the query
-        (i.e., "and", "or").
+    result = [{key: quote[key] for key in keys if key in quote} for quote in quotes]
 
-    Returns:
-      A dictionary representing the payload to be sent to the Yahoo Finance API
-      with the specified parameters.
+    return result
 
-    Examples:
-      filters = [
-        ["eq", ["region", "us"]],
-        ["btwn", ["intradaymarketcap", 2000000000, 10000000000]],
-        ["btwn", ["intradaymarketcap", 10000000000, 100000000000]],
-        ["gt", ["intradaymarketcap", 100000000000]],
-        ["gt", ["dayvolume", 5000000]]
-      ]
+  @staticmethod
+  def select(data, columns):
 
-      query = yfs.create_query(filters)
+    if all("." not in col for col in columns):
+      return data
 
-      payload = yfs.create_payload("equity", query)
-    """
+    names = data.column_names if hasattr(data, "column_names") else list(data.columns)
 
-    Check.sec_type(sec_type)
-    Check.size(size)
-    Check.offset(offset)
-    Check.sort_type(sort_type)
-    Check.top_operator(top_operator)
+    result = [name for name in names
+              if any((name == col) or name.startswith(col + ".") for col in columns)]
 
-    if query is None:
-      query = Query.create()
+    if hasattr(data, "column_names"):
+      result = data.select(result)
+    else:
+      result = data[result]
 
-    Check.fields(sec_type, query)
+    return result
 
-    if sort_field is None:
-      if (sec_type == "equity"):
+  @staticmethod
+  def table(quotes):
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if (len(quotes) == 0):
+      return pa.table({})
+
+    try:
+      result = pa.Table.from_struct_array(pa.array(quotes))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+
+      # a field with different types in the rows of the page (e.g., a number and a
+      # string) is normalized as a data frame and stored as strings
+      result_df = Process.page(quotes)
+
+      for col in result_df.columns:
+        if pd.api.types.infer_dtype(result_df[col], skipna = True).startswith("mixed"):
+          result_df[col] = result_df[col].map(lambda x: None if pd.isna(x) else str(x))
+
+      return pa.Table.from_pandas(result_df, preserve_index = False)
+
+    # first item of lists of records as columns, consistent with 'Process.cols'
+    for name in result.column_names:
+
+      col = result[name]
+
+      if not pa.types.is_list(col.type):
+        continue
+
+      result = result.drop_columns([name])
+
+      if pa.types.is_struct(col.type.value_type):
+
+        col = pc.if_else(pc.equal(pc.list_value_length(col), 0), pa.scalar(None, col.type), col)
+        col = pc.list_element(col, 0)
+
+        for field in col.type:
+          result = result.append_column(field.name, pc.struct_field(col, field.name))
+
+      else:
+        result = result.append_column(name, pa.nulls(len(result)))
+
+    # nested fields, consistent with 'pd.json_normalize' (e.g., "marketCap.raw")
+    while any(pa.types.is_struct(col.type) for col in result.columns):
+      result = result.flatten()
+
+    return result
+
+  @staticmethod
+  def concat(tables):
+
+    import pyarrow as pa
+
+    if (len(tables) == 0):
+      return pa.table({})
+
+    # union of columns with null columns promoted to the type in other tables and
+    # integer columns promoted to floating point when other tables have decimals
+    result = pa.concat_tables(tables, promote_options = "permissive")
+
+    return result
+
+  @staticmethod
+  def schema(schema):
+
+    import pyarrow as pa
+
+    fields = []
+
+    # types that later pages can be cast to: integers may be decimals on other pages
+    # and fields that are null on every row of the first page may be any type
+    for field in schema:
+
+      if pa.types.is_integer(field.type):
+        field = field.with_type(pa.float64())
+      elif pa.types.is_null(field.type):
+        field = field.with_type(pa.string())
+
+      fields.append(field)
+
+    result = pa.schema(fields)
+
+    return result
+
+  @staticmethod
+  def compact(df, sec_type):
+
+    types = Check.index[sec_type]["types"]
+    units = Check.index[sec_type]["units"]
+
+    # keep the raw value of formatted fields (e.g., "marketCap.raw" as "marketCap")
+    drop_cols = []
+    rename_cols = {}
+
+    for col in df.columns:
+
+      name, _, suffix = col.rpartition(".")
+
+      if (suffix == "raw") and (name not in df.columns):
+        rename_cols[col] = name
+      elif (suffix in ["fmt", "longFmt"]) and ((name + ".raw") in df.columns):
+        drop_cols.append(col)
+
+    df = df.drop(columns = drop_cols).rename(columns = rename_cols)
+
+    fields = {}
+
+    for field, key in Data.keys.items():
+      fields.setdefault(key, field)
+
+    for col in df.columns:
+
+      # quote keys (e.g., "marketCap") are matched to the fields in the filters data
+      field = fields.get(col, col.lower())
+
+      if (types.get(field) in ["int", "float"]) or (units.get(field) == "%"):
+        df[col] = pd.to_numeric(df[col], errors = "coerce")
+
+      elif (pd.api.types.infer_dtype(df[col], skipna = True) == "string"):
+
+        # repeated strings (e.g., exchange, currency) are stored once
+        if (df[col].nunique() <= len(df) / 2):
+          df[col] = df[col].astype("category")
+
+    return df
+
+  @staticmethod
+  def sort(df, sort_field, sort_type):
+
+    key = Data.keys.get(sort_field)
+
+    if key is None:
+      return df
+
+    cols = [col for col in [key + ".raw", key] if col in df.columns]
+
+    if (len(cols) == 0):
+      return df
+
+    # the API sorts in descending order when the type of sort is not provided
+    result = df.sort_values(cols[0], ascending = (sort_type == "asc"), kind = "stable",
+                            na_position = "last", ignore_index = True)
+
+    return result
+
+  @staticmethod
+  def windows(offset, size, max_size):
+
+    while (size > 0):
+
+      chunk_size = min(size, max_size)
+
+      yield offset, chunk_size
+
+      size -= chunk_size
+      offset += chunk_size
+
+  @staticmethod
+  def align(dfs):
+
+    # union of columns in order of appearance with missing values filled
+    result = pd.concat(dfs, ignore_index = True)
+
+    return result
+
+class Env:
+
+  @staticmethod
+  @contextlib.contextmanager
+  def with_(new_env):
+
+    old_env = {}
+
+    try:
+
+      for name, value in new_env.items():
+
+        old_env[name] = os.environ.get(name)
+
+        if value is None:
+          os.environ.pop(name, None)
+        else:
+          os.environ[name] = value
+
+      yield
+
+    finally:
+
+      for name, value in old_env.items():
+
+        if value is None:
+          os.environ.pop(name, None)
+        else:
+          os.environ[name] = value
+
+class Limiter:
+
+  _default = None
+
+  def __init__(self, rate = 5, burst = 5, shared = False):
+    """
+    Create a Rate Limiter for the Yahoo Finance API
+
+    A token bucket that limits the rate of requests to the Yahoo Finance API. The
+    bucket holds at most `burst` tokens and is refilled at `rate` tokens per second.
+    Each request takes one token and waits only as long as needed for a token to
+    become available. A limiter is thread-safe and can be shared across calls.
+
+    Parameters:
+      rate (float): number of requests per second.
+      burst (int): maximum number of requests that can be sent at once.
+      shared (bool): whether the bucket is kept in shared memory so that the limiter
+        can be passed to worker processes when they are created and limits the
+        requests of all processes together.
+
+    Examples:
+      limiter = yfs.Limiter(rate = 10, burst = 10)
+
+      data = yfs.get_data(payload, limiter = limiter)
+    """
+
+    Check.rate(rate)
+    Check.burst(burst)
+
+    self.rate = rate
+    self.burst = burst
+    self.shared = shared
+
+    # number of tokens and time of the last update
+    if shared:
+      self.state = multiprocessing.RawArray("d", [burst, time.monotonic()])
+      self.lock = multiprocessing.Lock()
+    else:
+      self.state = [burst, time.monotonic()]
+      self.lock = threading.Lock()
+
+  def reserve(self):
+
+    with self.lock:
+
+      now = time.monotonic()
+
+      tokens = min(self.burst, self.state[0] + (now - self.state[1]) * self.rate) - 1
+
+      self.state[0] = tokens
+      self.state[1] = now
+
+    # a negative balance is the time until the reserved token is available
+    result = max(0, -tokens / self.rate)
+
+    return result
+
+  def acquire(self):
+
+    result = self.reserve()
+
+    if (result > 0):
+      time.sleep(result)
+
+    return result
+
+  @staticmethod
+  def get():
+    """
+    Get the Process-Wide Rate Limiter
+
+    A method to get the rate limiter used when a limiter is not provided.
+
+    Returns:
+      A `Limiter` object or None when requests are not limited.
+
+    Examples:
+      limiter = yfs.get_limiter()
+    """
+
+    return Limiter._default
+
+  @staticmethod
+  def set(limiter):
+    """
+    Set the Process-Wide Rate Limiter
+
+    A method to set the rate limiter used when a limiter is not provided.
+
+    Parameters:
+      limiter (Limiter): rate limiter shared by all calls in the process or None
+        to not limit requests.
+
+    Examples:
+      yfs.set_limiter(yfs.Limiter(rate = 2, burst = 1))
+    """
+
+    if (limiter is not None) and not isinstance(limiter, Limiter):
+      raise ValueError("invalid 'limiter'")
+
+    Limiter._default = limiter
+
+Limiter._default = Limiter()
+
+class Retry:
+
+  def __init__(self, attempts = 3, backoff = 0.5, max_backoff = 30):
+    """
+    Create a Retry Policy for the Yahoo Finance API
+
+    A policy for requests that fail because of a connection error, a rate limit
+    (i.e., status 429), a server error (i.e., status 5xx), a rejected crumb (i.e.,
+    status 401), or a malformed response. A rejected crumb is refreshed before the
+    next attempt. Otherwise, the next attempt waits for the time in the Retry-After
+    header or, when the header is not provided, for a random time between zero and
+    `backoff` seconds that doubles with each attempt, in both cases up to
+    `max_backoff` seconds.
+
+    Parameters:
+      attempts (int): maximum number of attempts for each page.
+      backoff (float): maximum number of seconds to wait after the first attempt.
+      max_backoff (float): maximum number of seconds to wait after any attempt.
+
+    Examples:
+      retry = yfs.Retry(attempts = 5, backoff = 1)
+
+      data = yfs.get_data(payload, retry = retry)
+    """
+
+    Check.attempts(attempts)
+    Check.backoff(backoff)
+    Check.backoff(max_backoff)
+
+    self.attempts = attempts
+    self.backoff = backoff
+    self.max_backoff = max_backoff
+
+  @staticmethod
+  def retryable(status_code):
+    return (status_code == 401) or (status_code == 429) or (status_code >= 500)
+
+  @staticmethod
+  def after(response):
+
+    if response is None:
+      return None
+
+    value = response.headers.get("Retry-After")
+
+    if value is None:
+      return None
+
+    try:
+      return max(0, float(value))
+    except ValueError:
+      pass
+
+    try:
+      result = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+      return None
+
+    return max(0, result)
+
+  def delay(self, attempt, response = None):
+
+    result = Retry.after(response)
+
+    if result is None:
+
+      # "full jitter" so that workers that failed together do not retry together
+      result = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    # a long Retry-After (e.g., an hour) does not hold a worker for longer than the cap
+    result = min(self.max_backoff, result)
+
+    return result
+
+class Query:
+
+  @staticmethod
+  def create(filters = ["eq", ["region", "us"]], top_operator = "and"):
+    """
+    Create a Structured Query for the Yahoo Finance API
+
+    A method to create a structured query with logical operations and nested conditions
+    formatted for the Yahoo Finance API.
+
+    Parameters:
+      filters (list): each element is a sublist that defines a filtering condition with
+        the following structure:
+          - "comparison" (str): comparison operator (i.e., "gt", "lt", "eq", "btwn").
+          - "field" (list): field name (e.g., "region") and its associated value(s).
+      top_operator (str): top-level logical operator to combine all filters (i.e., "and", "or").
+
+    Returns:
+      A nested dictionary representing the structured query with logical operations and
+      nested conditions formatted for the Yahoo Finance API.
+
+    Examples:
+      filters = [
+        ["eq", ["region", "us"]],
+        ["btwn", ["intradaymarketcap", 2000000000, 10000000000]],
+        ["btwn", ["intradaymarketcap", 10000000000, 100000000000]],
+        ["gt", ["intradaymarketcap", 100000000000]],
+        ["gt", ["dayvolume", 5000000]]
+      ]
+
+      query = yfs.create_query(filters)
+    """
+
+    Check.filters(filters)
+    Check.top_operator(top_operator)
+
+    result_ls = Process.filters(filters)
+    result = {"operator": top_operator, "operands": []}
+
+    for key, operands in result_ls.items():
+      result["operands"].append({"operator": "or", "operands": operands})
+
+    result = Query.compile(result)
+
+    return result
+
+  @staticmethod
+  def compile(query):
+    """
+    Compile a Structured Query for the Yahoo Finance API
+
+    A method to simplify a structured query to an equivalent canonical query. Duplicate
+    conditions are removed, overlapping or adjacent ranges of a field that are combined
+    with "or" are merged (e.g., "btwn" 2e9 to 1e10 or "btwn" 1e10 to 1e11 is "btwn" 2e9
+    to 1e11), groups below the top level with the same operator are flattened, and the
+    operands of each group are sorted, so that queries with the same meaning are the
+    same. The operands of the top level are kept as groups of conditions. A range that
+    is merged into an unbounded range uses the "gte" or "lte" operator when its bound is
+    included.
+
+    Parameters:
+      query (dict): structured query created using the `create_query` method.
+
+    Returns:
+      A nested dictionary representing the compiled query.
+
+    Examples:
+      query = yfs.Query.compile(query)
+    """
+
+    # operands of the top level stay groups of conditions by field, which the API and
+    # the validation of fields expect, so only the groups are flattened
+    result = Query.group(query, top = True)
+
+    return result
+
+  @staticmethod
+  def group(query, top = False):
+
+    operator = query["operator"]
+
+    if (operator not in ["and", "or"]):
+      return {"operator": operator, "operands": list(query["operands"])}
+
+    operands = []
+
+    for operand in query["operands"]:
+
+      operand = Query.group(operand)
+
+      if (operand["operator"] == operator) and not top:
+        operands.extend(operand["operands"])
+      else:
+        operands.append(operand)
+
+    # duplicate conditions do not change the result of "and" or "or"
+    operands = list({json.dumps(operand, sort_keys = True): operand for operand in operands}.values())
+
+    if (operator == "or") and not top:
+      operands = Query.merge(operands)
+
+    operands.sort(key = Query.key)
+
+    result = {"operator": operator, "operands": operands}
+
+    return result
+
+  @staticmethod
+  def range(operand):
+
+    operator = operand["operator"]
+    operands = operand["operands"]
+
+    if (operator not in ["eq", "gt", "gte", "lt", "lte", "btwn"]):
+      return None
+
+    if (len(operands) != (3 if operator == "btwn" else 2)):
+      return None
+
+    if not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in operands[1:]):
+      return None
+
+    inf = float("inf")
+    value = operands[1]
+
+    # lower bound, whether it is included, upper bound, and whether it is included
+    if (operator == "eq"):
+      result = (value, True, value, True)
+    elif (operator == "gt"):
+      result = (value, False, inf, False)
+    elif (operator == "gte"):
+      result = (value, True, inf, False)
+    elif (operator == "lt"):
+      result = (-inf, False, value, False)
+    elif (operator == "lte"):
+      result = (-inf, False, value, True)
+    elif (operands[1] <= operands[2]):
+      result = (operands[1], True, operands[2], True)
+    else:
+      result = None
+
+    return result
+
+  @staticmethod
+  def merge(operands):
+
+    inf = float("inf")
+
+    ranges = {}
+    result = []
+
+    for operand in operands:
+
+      value = Query.range(operand)
+
+      if value is None:
+        result.append(operand)
+      else:
+        ranges.setdefault(operand["operands"][0], []).append((value, operand))
+
+    for field, values in ranges.items():
+
+      values.sort(key = lambda x: (x[0][0], not x[0][1]))
+      groups = []
+
+      for value, operand in values:
+
+        if (len(groups) > 0):
+
+          lower, lower_closed, upper, upper_closed = groups[-1][0]
+
+          overlap = ((value[0] < upper) or
+                     ((value[0] == upper) and (upper_closed or value[1])))
+
+          if overlap:
+
+            if (value[2] > upper):
+              upper, upper_closed = value[2], value[3]
+            elif (value[2] == upper):
+              upper_closed = upper_closed or value[3]
+
+            groups[-1][0] = (lower, lower_closed, upper, upper_closed)
+            groups[-1][1].append(operand)
+
+            continue
+
+        groups.append([value, [operand]])
+
+      for (lower, lower_closed, upper, upper_closed), group in groups:
+
+        if (len(group) == 1):
+          result.extend(group)
+        elif (lower == -inf) and (upper == inf):
+          result.extend(group)
+        elif (lower == -inf):
+          result.append({"operator": "lte" if upper_closed else "lt", "operands": [field, upper]})
+        elif (upper == inf):
+          result.append({"operator": "gte" if lower_closed else "gt", "operands": [field, lower]})
+        elif (lower == upper):
+          result.append({"operator": "eq", "operands": [field, lower]})
+        else:
+          result.append({"operator": "btwn", "operands": [field, lower, upper]})
+
+    return result
+
+  @staticmethod
+  def key(operand):
+
+    value = operand
+
+    while (value["operator"] in ["and", "or"]) and (len(value["operands"]) > 0):
+      value = value["operands"][0]
+
+    field = value["operands"][0] if (len(value["operands"]) > 0) else ""
+    value = Query.range(operand)
+
+    # conditions are ordered by field and then ranges by their lower bound
+    if value is None:
+      result = (str(field), 1, 0, json.dumps(operand, sort_keys = True))
+    else:
+      result = (str(field), 0, value[0], json.dumps(operand, sort_keys = True))
+
+    return result
+
+class Payload:
+
+  # fields that are split by the values in the data
+  shards = {
+    "categoryname": "categoryname",
+    "exchange": "exchange",
+    "fundfamilyname": "fundfamilyname",
+    "industry": "industry",
+    "peer_group": "peer_group",
+    "region": "region",
+    "sector": "sector"
+  }
+
+  # breaks of numeric fields with values over many orders of magnitude (e.g., market
+  # capitalization in dollars), which are split by powers of ten
+  breaks = {
+    "intradaymarketcap": [10 ** i for i in range(6, 13)],
+    "lastclosemarketcap.lasttwelvemonths": [10 ** i for i in range(6, 13)]
+  }
+
+  @staticmethod
+  def create(sec_type = "equity", query = None,
+             size = 25, offset = 0,
+             sort_field = None, sort_type = None,
+             top_operator = "and"):
+    """
+    Create a Payload for the Yahoo Finance API
+
+    A method to create a payload to query the Yahoo Finance API with customizable parameters.
+
+    Parameters:
+      sec_type (str): type of security to search
+        (i.e., "equity", "mutualfund", "etf", "index", "future").
+      query (list or tuple): structured query to filter results created by
+        the `create_query` method.
+      size (int): number of results to return.
+      offset (int): starting position of the results.
+      sort_field (str): field to sort the results.
+      sort_type (str): type of sort to apply (i.e., "asc", "desc").
+      top_operator (str): logical operator for the top-level of the query
+        (i.e., "and", "or").
+
+    Returns:
+      A dictionary representing the payload to be sent to the Yahoo Finance API
+      with the specified parameters.
+
+    Examples:
+      filters = [
+        ["eq", ["region", "us"]],
+        ["btwn", ["intradaymarketcap", 2000000000, 10000000000]],
+        ["btwn", ["intradaymarketcap", 10000000000, 100000000000]],
+        ["gt", ["intradaymarketcap", 100000000000]],
+        ["gt", ["dayvolume", 5000000]]
+      ]
+
+      query = yfs.create_query(filters)
+
+      payload = yfs.create_payload("equity", query)
+    """
+
+    Check.sec_type(sec_type)
+    Check.size(size)
+    Check.offset(offset)
+    Check.sort_type(sort_type)
+    Check.top_operator(top_operator)
+
+    if query is None:
+      query = Query.create()
+
+    Check.fields(sec_type, query)
+
+    if sort_field is None:
+      if (sec_type == "equity"):
         sort_field = "intradaymarketcap"
       elif (sec_type == "mutualfund"):
         sort_field = "fundnetassets"
@@ -490,67 +1475,1458 @@ class Payload:
       elif (sec_type == "future"):
         sort_field = "percentchange"
 
-    Check.sort_field(sec_type, sort_field)
+    Check.sort_field(sec_type, sort_field)
+
+    result = {
+      "includeFields": None, # unable to modify the result (see 'columns' of 'get_data')
+      "offset": offset,
+      "query": query,
+      "quoteType": sec_type,
+      "size": size,
+      "sortField": sort_field,
+      "sortType": sort_type,
+      "topOperator": top_operator,
+    }
+
+    return result
+
+  @staticmethod
+  def shard(payload, field, values = None):
+    """
+    Split a Payload for the Yahoo Finance API into Shards
+
+    A method to split a payload into payloads with disjoint queries that together cover
+    the same results when every result has one of the values of the field. Each shard
+    adds a condition on `field` to the query: one value of the field for each shard or,
+    for numeric fields, one range between consecutive breaks with the values below the
+    first break and above the last break.
+
+    Parameters:
+      payload (dict): payload created using the `create_payload` method with the "and"
+        top-level operator.
+      field (str): field used to split the query (e.g., "exchange", "sector",
+        "intradaymarketcap").
+      values (list): values or breaks of the field. When values are not provided, the
+        values of the field in the data (e.g., `data_exchange`) or, for market
+        capitalization, powers of ten from one million to one trillion are used. Values
+        must be provided for other numeric fields (e.g., "dayvolume"), whose rows would
+        otherwise mostly be in one shard.
+
+    Returns:
+      A list of payloads.
+
+    Examples:
+      payload = yfs.create_payload("equity", size = 100000)
+
+      payloads = yfs.Payload.shard(payload, "intradaymarketcap")
+    """
+
+    sec_type = payload["quoteType"]
+
+    if (field not in Check.index[sec_type]["fields"]):
+      raise ValueError("invalid 'field' for 'sec_type'")
+
+    if (payload["topOperator"] != "and") or (payload["query"]["operator"] != "and"):
+      raise ValueError("value of 'top_operator' must be 'and'")
+
+    numeric = Check.index[sec_type]["types"][field] in ["int", "float"]
+
+    if values is None:
+
+      if (field in Payload.breaks):
+        values = Payload.breaks[field]
+      elif (field in Payload.shards):
+        values = list(getattr(Data, Payload.shards[field])["value"])
+      else:
+        raise ValueError("'values' must be provided for 'field'")
+
+    values = list(values)
+
+    if (len(values) == 0):
+      raise ValueError("invalid 'values'")
+
+    if numeric:
+
+      values = sorted(values)
+
+      filters = [["lt", [field, values[0]]]]
+      filters.extend(["btwn", [field, lower, upper]] for lower, upper in zip(values[:-1], values[1:]))
+      filters.append(["gt", [field, values[-1]]])
+
+    else:
+      filters = [["eq", [field, value]] for value in values]
+
+    result = []
+
+    for filter in filters:
+
+      query = payload["query"]
+      operands = list(query["operands"])
+
+      operands.extend(Query.create(filter)["operands"])
+
+      result.append(dict(payload, query = dict(query, operands = operands)))
+
+    return result
+
+  @staticmethod
+  def hash(payload):
+    """
+    Hash a Payload for the Yahoo Finance API
+
+    A method to create a hash of a payload that does not depend on the order of its keys
+    or on the form of its query, which is compiled using the `Query.compile` method.
+
+    Parameters:
+      payload (dict): payload created using the `create_payload` method.
+
+    Returns:
+      A string with the hexadecimal SHA-256 digest of the payload.
+
+    Examples:
+      payload = yfs.create_payload("equity")
+
+      key = yfs.Payload.hash(payload)
+    """
+
+    payload = dict(payload, query = Query.compile(payload["query"]))
+
+    result = json.dumps(payload, sort_keys = True, separators = (",", ":"))
+    result = hashlib.sha256(result.encode("utf-8")).hexdigest()
+
+    return result
+
+class Api:
+
+  crumb_url = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+  screener_url = "https://query1.finance.yahoo.com/v1/finance/screener"
+
+  accept = "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8"
+  user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
+
+  @staticmethod
+  def params(crumb):
+
+    result = {
+      "crumb": crumb,
+      "lang": "en-US",
+      "region": "US",
+      "formatted": "true",
+      "corsDomain": "finance.yahoo.com",
+    }
+
+    return result
+
+class Tuner:
+
+  def __init__(self, workers = 1, rate = 5, max_workers = 16, max_rate = 50, slowdown = 2):
+    """
+    Create an Adaptive Tuner for the Yahoo Finance API
+
+    A controller that adjusts the number of pages in flight and the rate of requests
+    while data is requested. The values are increased additively after each successful
+    response that is not slow: by about one page in flight and, while the rate limits
+    the requests, one request per second for each round of responses, up to the
+    `workers` of the call and the rate of its limiter. The values are decreased
+    multiplicatively, at most once per round trip: halved after a rate limit (i.e.,
+    status 429), a server error (i.e., status 5xx), or a connection error, and reduced
+    by a quarter while the moving average of the time of the responses is `slowdown`
+    times the fastest of the last 32 responses. Other errors do not change the values.
+    The tuned values can be used to create the tuner of a later call.
+
+    Parameters:
+      workers (int): initial number of pages in flight.
+      rate (float): initial number of requests per second.
+      max_workers (int): maximum number of pages in flight.
+      max_rate (float): maximum number of requests per second.
+      slowdown (float): ratio of the average time of the responses to the fastest
+        recent time above which the responses are slow.
+
+    Examples:
+      tuner = yfs.Tuner()
+
+      data = yfs.get_data(payload, workers = 16, tuner = tuner)
+
+      tuner = yfs.Tuner(**tuner.to_dict())
+    """
+
+    Check.workers(workers)
+    Check.rate(rate)
+    Check.workers(max_workers)
+    Check.rate(max_rate)
+    Check.slowdown(slowdown)
+
+    self.max_workers = max_workers
+    self.max_rate = max_rate
+    self.slowdown = slowdown
+    self.workers = min(max(1, workers), max_workers)
+    self.rate = min(rate, max_rate)
+    self.latency = collections.deque(maxlen = 32)
+    self.average = None
+    self.time = 0
+    self.ceiling = (max_workers, max_rate)
+    self.throttled = False
+    self.limiter = Limiter(self.rate, burst = 1)
+    self.lock = threading.Lock()
+
+  def bind(self, workers, limiter):
+
+    with self.lock:
+
+      # values are only increased up to the limits of the call so that the tuned
+      # values are those that were in effect (e.g., not above the rate of the limiter)
+      max_rate = self.max_rate if (limiter is None) else min(self.max_rate, limiter.rate)
+
+      self.ceiling = (min(self.max_workers, workers), max_rate)
+      self.workers = min(self.workers, self.ceiling[0])
+      self.rate = min(self.rate, self.ceiling[1])
+      self.limiter.rate = self.rate
+
+  def target(self):
+    return max(1, int(self.workers))
+
+  def acquire(self):
+
+    result = self.limiter.acquire()
+
+    # the rate is only increased while it is what limits the requests
+    if (result > 0):
+      self.throttled = True
+
+    return result
+
+  def update(self, latency, status_code = 200):
+
+    with self.lock:
+
+      now = time.monotonic()
+
+      if (status_code == 200):
+
+        # recent times, so that one unusually fast response is forgotten, and moving
+        # average of the time of the responses
+        self.latency.append(latency)
+
+        if (self.average is None):
+          self.average = latency
+        else:
+          self.average = 0.8 * self.average + 0.2 * latency
+
+      if (status_code is None) or (status_code == 429) or (status_code >= 500):
+        factor = 0.5
+      elif (status_code != 200):
+
+        # other errors (e.g., a rejected crumb) say nothing about the load
+        return
+
+      elif (self.average is not None) and (self.average > self.slowdown * min(self.latency)):
+        factor = 0.75
+      else:
+        factor = None
+
+      if factor is None:
+
+        # additive increase of about one for each round of responses
+        self.workers = min(self.ceiling[0], self.workers + 1 / self.workers)
+
+        if self.throttled:
+          self.rate = min(self.ceiling[1], self.rate + 1 / self.workers)
+          self.throttled = False
+
+      elif (now - self.time > (latency if (self.average is None) else self.average)):
+
+        # multiplicative decrease once for responses of the same round trip
+        self.workers = max(1, self.workers * factor)
+        self.rate = max(0.1, self.rate * factor)
+        self.time = now
+
+      self.limiter.rate = self.rate
+
+  def to_dict(self):
+    """
+    Get the Tuned Values as a Dictionary
+
+    A method to get the tuned values to create the tuner of a later call.
+
+    Returns:
+      A dictionary with the number of pages in flight ("workers"), the number of
+      requests per second ("rate"), and the arguments of the tuner.
+
+    Examples:
+      tuner.to_dict()
+    """
+
+    with self.lock:
+
+      result = {
+        "workers": max(1, int(self.workers)),
+        "rate": self.rate,
+        "max_workers": self.max_workers,
+        "max_rate": self.max_rate,
+        "slowdown": self.slowdown
+      }
+
+    return result
+
+class Stats:
+
+  def __init__(self, hook = None):
+    """
+    Create Statistics for Requests to the Yahoo Finance API
+
+    A thread-safe record of where the time of a call goes. Each event has a phase,
+    a duration in seconds, and the fields of the event (e.g., "offset", "size",
+    "status", "bytes", "rows"). The phases are:
+      - "session": getting the process-wide session.
+      - "crumb": refreshing a rejected crumb.
+      - "wait": waiting for the rate limiter.
+      - "retry": waiting before another attempt of a failed request.
+      - "request": the HTTP round-trip of a request.
+      - "decode": decoding the JSON of a response.
+      - "normalize": building the columns of a page.
+      - "cols": flattening the list-valued columns of a page.
+      - "cache": returning a page from the cache.
+      - "coalesced": waiting for the same page requested by another call.
+      - "page": a page that was returned (with its "rows").
+      - "failed": a page that failed after all attempts.
+      - "align": combining the pages.
+      - "compact": compacting a page or the result.
+
+    Parameters:
+      hook (callable): function called with a dictionary of the "phase", the
+        "duration", and the fields of each event. The function is called from the
+        thread of the request, so it should be thread-safe and return quickly.
+
+    Examples:
+      stats = yfs.Stats(hook = print)
+
+      data = yfs.get_data(payload, workers = 4, stats = stats)
+
+      stats.to_dict()
+    """
+
+    if (hook is not None) and not callable(hook):
+      raise ValueError("invalid 'hook'")
+
+    self.hook = hook
+    self.durations = collections.defaultdict(float)
+    self.counts = collections.defaultdict(int)
+    self.bytes = 0
+    self.rows = 0
+    self.lock = threading.Lock()
+
+  def add(self, phase, duration = 0, **fields):
+
+    with self.lock:
+
+      self.durations[phase] += duration
+      self.counts[phase] += 1
+      self.bytes += fields.get("bytes", 0)
+
+      if (phase == "page"):
+        self.rows += fields.get("rows", 0)
+
+    if self.hook is not None:
+      self.hook(dict(phase = phase, duration = duration, **fields))
+
+  @contextlib.contextmanager
+  def time(self, phase, **fields):
+
+    start = time.perf_counter()
+
+    try:
+      yield
+    finally:
+      self.add(phase, time.perf_counter() - start, **fields)
+
+  def to_dict(self):
+    """
+    Get the Statistics as a Dictionary
+
+    A method to get the totals of the recorded events for export.
+
+    Returns:
+      A dictionary with the number of "pages", "rows", "requests", "bytes",
+      "retries", "failed" pages, the "wait" time of the rate limiter in seconds,
+      and the "durations" and "counts" of each phase.
+
+    Examples:
+      stats.to_dict()
+    """
+
+    with self.lock:
+
+      result = {
+        "pages": self.counts["page"],
+        "rows": self.rows,
+        "requests": self.counts["request"],
+        "bytes": self.bytes,
+        "retries": self.counts["retry"],
+        "failed": self.counts["failed"],
+        "wait": self.durations["wait"],
+        "durations": dict(self.durations),
+        "counts": dict(self.counts)
+      }
+
+    return result
+
+class Cache:
+
+  def __init__(self, path = None, ttl = 60, max_bytes = 256 * 1024 ** 2):
+    """
+    Create a Cache for the Yahoo Finance API
+
+    A cache of pages of data from the Yahoo Finance API stored on disk. Each page is
+    keyed by a hash of the payload and its offset and size, so that the same query
+    from different calls or processes is returned without a request until it expires.
+    The least recently used pages are removed when the cache exceeds `max_bytes`.
+
+    Parameters:
+      path (str): directory of the cache. When a path is not provided, the
+        "yfscreen" directory in the user's cache directory is used.
+      ttl (float or dict): number of seconds until a page expires or a dictionary
+        with the number of seconds for each `sec_type`.
+      max_bytes (int): maximum size of the cache in bytes.
+
+    Examples:
+      cache = yfs.Cache(ttl = {"equity": 60, "mutualfund": 3600})
+
+      data = yfs.get_data(payload, cache = cache)
+    """
+
+    if path is None:
+      path = os.path.join(os.path.expanduser("~"), ".cache", "yfscreen")
+
+    if isinstance(ttl, dict):
+      for value in ttl.values():
+        Check.ttl(value)
+    else:
+      Check.ttl(ttl)
+
+    Check.max_bytes(max_bytes)
+
+    os.makedirs(path, exist_ok = True)
+
+    self.path = path
+    self.ttl = ttl
+    self.max_bytes = max_bytes
+
+  def file(self, payload, offset, size, output, columns = None):
+
+    key = Payload.hash(dict(payload, offset = offset, size = size))
+
+    # pages with selected columns are stored separately from the full pages
+    if columns is not None:
+      key = hashlib.sha256((key + json.dumps(list(columns))).encode("utf-8")).hexdigest()
+    result = os.path.join(self.path, key + "." + output + ".pkl")
+
+    return result
+
+  def get(self, payload, offset, size, output = "pandas", columns = None):
+
+    file = self.file(payload, offset, size, output, columns)
+
+    if isinstance(self.ttl, dict):
+      ttl = self.ttl.get(payload["quoteType"], 0)
+    else:
+      ttl = self.ttl
+
+    try:
+
+      with open(file, "rb") as f:
+        result = pickle.load(f)
+
+    except (OSError, EOFError, pickle.UnpicklingError):
+      return None
+
+    # a file that is not a page of the cache is a miss
+    valid_result = (isinstance(result, dict) and ("data" in result) and
+                    isinstance(result.get("time"), (int, float)))
+
+    if not valid_result:
+      return None
+
+    if (time.time() - result["time"] > ttl):
+      return None
+
+    # the modification time orders pages by last use
+    try:
+      os.utime(file)
+    except OSError:
+      pass
+
+    return result["data"]
+
+  def set(self, payload, offset, size, data, output = "pandas", columns = None):
+
+    file = self.file(payload, offset, size, output, columns)
+
+    fd, temp_file = tempfile.mkstemp(dir = self.path, suffix = ".tmp")
+
+    with os.fdopen(fd, "wb") as f:
+      pickle.dump({"time": time.time(), "data": data}, f, protocol = pickle.HIGHEST_PROTOCOL)
+
+    os.replace(temp_file, file)
+
+    self.evict()
+
+  def evict(self):
+
+    files = []
+
+    for entry in os.scandir(self.path):
+
+      if entry.name.endswith(".pkl"):
+
+        try:
+          stat = entry.stat()
+        except OSError:
+          continue
+
+        files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    size = sum(file[1] for file in files)
+
+    for _, file_size, file in sorted(files):
+
+      if (size <= self.max_bytes):
+        break
+
+      try:
+        os.remove(file)
+      except OSError:
+        pass
+
+      size -= file_size
+
+  def clear(self):
+
+    for entry in os.scandir(self.path):
+
+      if entry.name.endswith(".pkl"):
+
+        try:
+          os.remove(entry.path)
+        except OSError:
+          pass
+
+class Snapshot:
+
+  def __init__(self, path = None):
+    """
+    Create a Snapshot Store for the Yahoo Finance API
+
+    A store of the last result of each payload, keyed by a hash of the payload, used to
+    return only the changes since the last result. Snapshots are kept in memory or, when
+    a path is provided, on disk so that they are shared across runs.
+
+    Parameters:
+      path (str): directory of the snapshots. When a path is not provided, the
+        snapshots are kept in memory.
+
+    Examples:
+      snapshot = yfs.Snapshot("snapshots")
+
+      delta = snapshot.get(payload, fields = ["regularMarketPrice.raw"])
+    """
+
+    if path is not None:
+      os.makedirs(path, exist_ok = True)
+
+    self.path = path
+    self.data = {}
+
+  def load(self, key):
+
+    if self.path is None:
+      return self.data.get(key)
+
+    try:
+
+      with open(os.path.join(self.path, key + ".pkl"), "rb") as f:
+        result = pickle.load(f)
+
+    except FileNotFoundError:
+      result = None
+
+    return result
+
+  def save(self, key, data):
+
+    if self.path is None:
+
+      self.data[key] = data
+      return
+
+    fd, temp_file = tempfile.mkstemp(dir = self.path, suffix = ".tmp")
+
+    with os.fdopen(fd, "wb") as f:
+      pickle.dump(data, f, protocol = pickle.HIGHEST_PROTOCOL)
+
+    os.replace(temp_file, os.path.join(self.path, key + ".pkl"))
+
+  def get(self, payload = None, session = None, fields = None, workers = 1, limiter = None):
+    """
+    Get the Changes in Data from the Yahoo Finance API
+
+    A method to get data from the Yahoo Finance API using the specified payload and
+    return only the symbols that entered or exited the result or whose fields changed
+    since the last call with the same payload. The result is stored as the new snapshot.
+
+    Parameters:
+      payload (dict): payload that contains search criteria created using
+        the `create_query` and `create_payload` methods.
+      session (dict): session created using the `get_session` method. When a
+        session is not provided, the process-wide session is used.
+      fields (list): columns compared between snapshots and returned. When fields
+        are not provided, all columns are returned and the columns in both snapshots
+        are compared.
+      workers (int): maximum number of pages to request concurrently.
+      limiter (Limiter): rate limiter for the requests. When a limiter is not
+        provided, the process-wide limiter is used.
+
+    Returns:
+      A data frame with a "symbol" column, a "change" column (i.e., "entered",
+      "exited", "changed"), and the compared fields with the new values or, for
+      exited symbols, the last values. When any window of rows fails (see
+      `get_data`), the snapshot is not stored and no symbol is reported as exited.
+
+    Examples:
+      snapshot = yfs.Snapshot()
+
+      delta = snapshot.get(payload)
+    """
+
+    if payload is None:
+      payload = Payload.create()
+
+    key = Payload.hash(payload)
+
+    result = get(payload, session, workers, limiter)
+    failed = result.attrs["failed"]
+
+    if (len(result) > 0) and ("symbol" in result.columns):
+      result = result.drop_duplicates(subset = "symbol").set_index("symbol")
+    else:
+      result = pd.DataFrame(index = pd.Index([], name = "symbol"))
+
+    old_result = self.load(key)
+
+    if old_result is None:
+      old_result = pd.DataFrame(index = pd.Index([], name = "symbol"))
+
+    # a partial result is not stored and its missing symbols are not reported as exited
+    if (len(failed) == 0):
+      self.save(key, result)
+
+    result = Snapshot.diff(old_result, result, fields)
+
+    if (len(failed) > 0):
+      result = result.loc[result["change"] != "exited"].reset_index(drop = True)
+
+    result.attrs["failed"] = failed
+
+    return result
+
+  @staticmethod
+  def diff(old_df, new_df, fields = None):
+
+    if fields is None:
+      fields = list(new_df.columns) + [col for col in old_df.columns if col not in new_df.columns]
+
+    compare_fields = [field for field in fields
+                      if (field in old_df.columns) and (field in new_df.columns)]
+
+    entered = new_df.index.difference(old_df.index, sort = False)
+    exited = old_df.index.difference(new_df.index, sort = False)
+    common = new_df.index.intersection(old_df.index, sort = False)
+
+    old_common = old_df.loc[common, compare_fields]
+    new_common = new_df.loc[common, compare_fields]
+
+    # missing values in both snapshots are not a change
+    changed = (old_common != new_common) & ~(old_common.isna() & new_common.isna())
+    changed = common[changed.any(axis = 1).to_numpy()]
+
+    result_ls = []
+
+    for change, df, index in [("entered", new_df, entered), ("exited", old_df, exited),
+                              ("changed", new_df, changed)]:
+
+      result_df = df.loc[index, [col for col in fields if col in df.columns]]
+      result_df.insert(0, "change", change)
+
+      result_ls.append(result_df)
+
+    result = pd.concat(result_ls)
+    result.index.name = "symbol"
+    result = result.reset_index()
+
+    return result
+
+class Session:
+
+  _shared = None
+  _time = None
+  _pool_size = 10
+  _lock = threading.RLock()
+  _refresh_lock = threading.Lock()
+
+  @staticmethod
+  def get(limiter = None, pool_size = 10):
+    """
+    Get the Crumb, Cookies, and Handle for the Yahoo Finance API
+
+    A method to get the crumb, cookies, and handle required to authenticate and interact
+    with the Yahoo Finance API.
+
+    Parameters:
+      limiter (Limiter): rate limiter for the request. When a limiter is not
+        provided, the process-wide limiter is used.
+      pool_size (int): maximum number of connections kept alive by the handle,
+        which should be at least the number of `workers` used with the session.
+
+    Returns:
+      A dictionary containing the following elements:
+        - "handle" (requests.Session): a session handle object for subsequent requests.
+        - "crumb" (str): a string representing the crumb value for authentication.
+        - "cookies" (dict): a dictionary of cookies for the request.
+
+    Examples:
+      session = yfs.get_session()
+    """
+
+    Check.pool_size(pool_size)
+
+    session = requests.Session()
+
+    headers = {
+      "Accept": Api.accept,
+      "User-Agent": Api.user_agent,
+    }
+
+    session.headers.update(headers)
+
+    Session.mount(session, pool_size)
+
+    result = {
+      "handle": session,
+      "crumb": None,
+      "cookies": {}
+    }
+
+    Session.refresh(result, limiter = limiter)
+
+    return result
+
+  @staticmethod
+  def mount(handle, pool_size):
+
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize = pool_size)
+
+    # connections of a replaced adapter are closed when it is no longer used
+    for prefix in ["https://", "http://"]:
+      handle.mount(prefix, adapter)
+
+  @staticmethod
+  def refresh(session, crumb = None, limiter = None):
+    """
+    Refresh the Crumb and Cookies for the Yahoo Finance API
+
+    A method to get a new crumb and cookies for an existing session, reusing its handle
+    and connections. The session is updated in place.
+
+    Parameters:
+      session (dict): session created using the `get_session` method.
+      crumb (str): crumb that was rejected. When the crumb of the session has
+        already changed, e.g., in another thread, the session is not refreshed again.
+      limiter (Limiter): rate limiter for the request. When a limiter is not
+        provided, the process-wide limiter is used.
+
+    Returns:
+      The updated session.
+
+    Examples:
+      session = yfs.get_session()
+
+      session = yfs.Session.refresh(session)
+    """
+
+    # a lock of its own so that requests that only get the process-wide session do not
+    # wait for the crumb
+    with Session._refresh_lock:
+
+      if (crumb is None) or (session["crumb"] == crumb):
+
+        handle = session["handle"]
+
+        if limiter is None:
+          limiter = Limiter.get()
+
+        if limiter is not None:
+          limiter.acquire()
+
+        with Env.with_({"CURL_SSL_BACKEND": "openssl"}):
+          response = handle.get(Api.crumb_url)
+
+        session["crumb"] = response.text.strip()
+        session["cookies"] = handle.cookies.get_dict()
+
+    return session
+
+  @staticmethod
+  def cookies(session):
+
+    handle = session["handle"]
+    handle_cookies = handle.cookies.get_dict()
+
+    for key, value in session["cookies"].items():
+      if (handle_cookies.get(key) != value):
+        handle.cookies.set(key, value)
+
+  @staticmethod
+  def shared(ttl = 3600, limiter = None, pool_size = None):
+    """
+    Get the Process-Wide Session for the Yahoo Finance API
+
+    A method to get a session that is shared by all calls in the process. The crumb and
+    cookies are reused until they are older than `ttl` seconds, when they are refreshed
+    with the same handle, and connections are kept alive between calls. A new crumb is
+    requested earlier only when the server rejects the current one.
+
+    Parameters:
+      ttl (float): maximum age of the crumb and cookies in seconds.
+      limiter (Limiter): rate limiter for the request. When a limiter is not
+        provided, the process-wide limiter is used.
+      pool_size (int): minimum number of connections kept alive by the handle. The
+        pool of the handle grows to the largest `pool_size` or `workers` of any call
+        and is never smaller than 10.
+
+    Returns:
+      A dictionary with the same elements as the `get_session` method.
+
+    Examples:
+      session = yfs.Session.shared()
+    """
+
+    Check.ttl(ttl)
+
+    with Session._lock:
+
+      if pool_size is not None:
+        Session.grow(pool_size)
+
+      now = time.monotonic()
+      expired = False
+
+      if (Session._shared is None):
+
+        Session._shared = Session.get(limiter, Session._pool_size)
+        Session._time = now
+
+      elif (now - Session._time > ttl):
+
+        # one thread refreshes the crumb and the others use the current crumb meanwhile
+        expired = True
+        Session._time = now
+
+      result = Session._shared
+
+    # the handle and its connections are kept and only the crumb and cookies are new
+    if expired:
+      Session.refresh(result, result["crumb"], limiter)
+
+    return result
+
+  @staticmethod
+  def grow(pool_size):
+
+    Check.pool_size(pool_size)
+
+    with Session._lock:
+
+      # one connection for each worker so that connections are not discarded and opened again
+      if (pool_size > Session._pool_size):
+
+        Session._pool_size = pool_size
+
+        if Session._shared is not None:
+          Session.mount(Session._shared["handle"], pool_size)
+
+class Pool:
+
+  _limiter = None
+
+  @staticmethod
+  def executor(processes, limiter):
+
+    # a limiter that is not in shared memory is copied to limit all processes together
+    if (limiter is not None) and not limiter.shared:
+      limiter = Limiter(limiter.rate, limiter.burst, shared = True)
+
+    # each call starts its own processes, so each process starts an interpreter and
+    # requests its own crumb, which is only worth it for calls with many pages
+    result = concurrent.futures.ProcessPoolExecutor(max_workers = processes,
+                                                    initializer = Pool.init,
+                                                    initargs = (limiter, Api.crumb_url,
+                                                                Api.screener_url))
+
+    return result
+
+  @staticmethod
+  def init(limiter, crumb_url, screener_url):
+
+    # processes that are spawned instead of forked use the URLs of the parent process
+    Pool._limiter = limiter
+    Api.crumb_url = crumb_url
+    Api.screener_url = screener_url
+
+  @staticmethod
+  def get(payload, offset, size, cache, retry, columns):
+
+    events = []
+
+    # each process requests pages with its own process-wide session and the events
+    # are returned to be recorded in the statistics of the parent process
+    result_df = Page.get(None, payload, offset, size, Pool._limiter, cache, "pandas", retry,
+                         Stats(hook = events.append), columns, None)
+
+    return result_df, events
+
+class Page:
+
+  _flights = {}
+  _lock = threading.Lock()
+
+  @staticmethod
+  def get(session, payload, offset, size, limiter, cache, output, retry, stats, columns,
+          tuner):
+
+    key = (Payload.hash(dict(payload, offset = offset, size = size)), output,
+           None if columns is None else tuple(columns))
+
+    # concurrent requests for the same page wait for the first request
+    with Page._lock:
+
+      future = Page._flights.get(key)
+      leader = future is None
+
+      if leader:
+        future = concurrent.futures.Future()
+        Page._flights[key] = future
+
+    if not leader:
+
+      with stats.time("coalesced", offset = offset, size = size):
+        result_df = future.result()
+
+      if (output == "pandas") and (result_df is not None):
+        result_df = result_df.copy()
+
+      return result_df
+
+    try:
+
+      result_df = Page.fetch(session, payload, offset, size, limiter, cache, output, retry,
+                             stats, columns, tuner)
+      future.set_result(result_df)
+
+    except BaseException as e:
+
+      future.set_exception(e)
+      raise
+
+    finally:
+
+      with Page._lock:
+        del Page._flights[key]
+
+    return result_df
+
+  @staticmethod
+  def fetch(session, payload, offset, size, limiter, cache, output, retry, stats, columns,
+            tuner):
+
+    if cache is not None:
+
+      with stats.time("cache", offset = offset, size = size):
+        result_df = cache.get(payload, offset, size, output, columns)
+
+      if result_df is not None:
+
+        stats.add("page", offset = offset, size = size, rows = len(result_df))
+
+        return result_df
+
+    # the process-wide session is only needed when the page is not in the cache
+    if session is None:
+      with stats.time("session"):
+        session = Session.shared(limiter = limiter)
+
+    payload = dict(payload, offset = offset, size = size)
+
+    headers = {
+      "User-Agent": Api.user_agent
+    }
+
+    result = None
+
+    for attempt in range(retry.attempts):
+
+      if (attempt > 0):
+
+        if (response is None) or (response.status_code != 401):
+          delay = retry.delay(attempt - 1, response)
+        else:
+          delay = 0
+
+        stats.add("retry", delay, offset = offset, size = size, attempt = attempt)
+        time.sleep(delay)
+
+      crumb = session["crumb"]
+
+      if limiter is not None:
+        stats.add("wait", limiter.acquire())
+
+      if tuner is not None:
+        stats.add("wait", tuner.acquire())
+
+      start = time.perf_counter()
+
+      try:
+        response = session["handle"].post(Api.screener_url, params = Api.params(crumb),
+                                          json = payload, headers = headers)
+      except requests.RequestException:
+
+        if tuner is not None:
+          tuner.update(time.perf_counter() - start, None)
+
+        stats.add("request", time.perf_counter() - start, offset = offset, size = size,
+                  status = None)
+
+        response = None
+        continue
+
+      if tuner is not None:
+        tuner.update(time.perf_counter() - start, response.status_code)
+
+      stats.add("request", time.perf_counter() - start, offset = offset, size = size,
+                status = response.status_code, bytes = len(response.content))
+
+      if (response.status_code == 401):
+
+        # the crumb was rejected so get a new crumb before the next attempt
+        try:
+          with stats.time("crumb"):
+            Session.refresh(session, crumb, limiter)
+        except requests.RequestException:
+          pass
+
+        continue
+
+      if (response.status_code != 200):
+
+        if not Retry.retryable(response.status_code):
+          break
+
+        continue
+
+      try:
+
+        with stats.time("decode", offset = offset, size = size):
+          result = Process.loads(response.content)
+
+        result = result["finance"]["result"][0].get("quotes", [])
+        break
+
+      except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        result = None
+
+    # a page that failed after all attempts is reported instead of treated as empty
+    if result is None:
+
+      stats.add("failed", offset = offset, size = size)
+
+      return None
 
-    result = {
-      "includeFields": None, # unable to modify the result
-      "offset": offset,
-      "query": query,
-      "quoteType": sec_type,
-      "size": size,
-      "sortField": sort_field,
-      "sortType": sort_type,
-      "topOperator": top_operator,
-    }
+    if columns is not None:
+      result = Process.prune(result, columns)
+
+    if (output == "arrow"):
+
+      with stats.time("normalize", offset = offset, size = size):
+        result_df = Process.table(result)
+
+    elif (len(result) == 0):
+      result_df = pd.DataFrame()
+    else:
+
+      with stats.time("normalize", offset = offset, size = size):
+        result_df = Process.frame(result)
+
+      with stats.time("cols", offset = offset, size = size):
+        result_df = Process.cols(result_df)
+
+    if columns is not None:
+      result_df = Process.select(result_df, columns)
+
+    stats.add("page", offset = offset, size = size, rows = len(result_df))
+
+    if (cache is not None) and (len(result_df) > 0):
+      cache.set(payload, offset, size, result_df, output, columns)
+
+    return result_df
+
+  @staticmethod
+  def limit(workers, tuner):
+
+    if tuner is None:
+      return workers
+
+    result = min(workers, tuner.target())
 
     return result
 
-class Session:
+  @staticmethod
+  def failed(payload, windows):
+
+    result_ls = []
+
+    # adjacent windows are merged so that each gap is requested once
+    for offset, size in sorted(windows):
+
+      if (len(result_ls) > 0) and (result_ls[-1][0] + result_ls[-1][1] == offset):
+        result_ls[-1][1] += size
+      else:
+        result_ls.append([offset, size])
+
+    result = [dict(payload, offset = offset, size = size) for offset, size in result_ls]
+
+    return result
 
   @staticmethod
-  def get():
-    """
-    Get the Crumb, Cookies, and Handle for the Yahoo Finance API
+  def iter(session, payload, workers, limiter, cache, compact, output, retry, failed, stats,
+           columns, tuner):
 
-    A method to get the crumb, cookies, and handle required to authenticate and interact
-    with the Yahoo Finance API.
+    max_size = 250
+    end = payload["offset"] + payload["size"]
+    windows = Process.windows(payload["offset"], payload["size"], max_size)
 
-    Returns:
-      A dictionary containing the following elements:
-        - "handle" (requests.Session): a session handle object for subsequent requests.
-        - "crumb" (str): a string representing the crumb value for authentication.
-        - "cookies" (dict): a dictionary of cookies for the request.
+    if tuner is not None:
+      tuner.bind(workers, limiter)
 
-    Examples:
-      session = yfs.get_session()
-    """
+    if session is None:
+      Session.grow(workers)
 
-    session = requests.Session()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers = workers)
+    pending = collections.deque()
+    errors = []
 
-    api_url = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+    def submit():
 
-    headers = {
-      "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-      "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36",
-    }
+      n = max(0, Page.limit(workers, tuner) - len(pending))
 
-    session.headers.update(headers)
+      for offset, chunk_size in itertools.islice(windows, n):
 
-    with Env.with_({"CURL_SSL_BACKEND": "openssl"}):
-      response = session.get(api_url)
+        future = executor.submit(Page.get, session, payload, offset, chunk_size, limiter,
+                                 cache, output, retry, stats, columns, tuner)
+        pending.append((offset, chunk_size, future))
 
-    crumb = response.text.strip()
-    cookies = session.cookies.get_dict()
+    def stop():
 
-    result = {
-      "handle": session,
-      "crumb": crumb,
-      "cookies": cookies
-    }
+      for _, _, future in pending:
+        future.cancel()
 
-    return result
+      pending.clear()
+
+    try:
+
+      # at most 'workers' windows are in flight and results are consumed in order
+      submit()
+
+      while (len(pending) > 0):
+
+        offset, chunk_size, future = pending.popleft()
+        result_df = future.result()
+
+        if result_df is None:
+
+          errors.append((offset, chunk_size))
+
+          # stop after as many failed windows as workers and report the rest as failed
+          if (len(errors) >= workers):
+
+            window = pending[0][:2] if (len(pending) > 0) else next(windows, None)
+
+            if window is not None:
+              errors.append((window[0], end - window[0]))
+
+            stop()
+
+          else:
+            submit()
+
+          continue
+
+        # a short or empty page is the last page
+        if (len(result_df) < chunk_size):
+          stop()
+        else:
+          submit()
+
+        if (len(result_df) > 0):
+
+          if compact:
+            with stats.time("compact", offset = offset, size = chunk_size):
+              result_df = Process.compact(result_df, payload["quoteType"])
+
+          yield result_df
+
+    finally:
+
+      stop()
+      executor.shutdown(wait = True)
+
+      if failed is not None:
+        failed.extend(Page.failed(payload, errors))
+
+  @staticmethod
+  def batch(session, payloads, workers, limiter, cache, retry, stats, columns, processes,
+            tuner):
+
+    max_size = 250
+
+    windows = {key: Process.windows(payload["offset"], payload["size"], max_size)
+               for key, payload in payloads.items()}
+
+    if tuner is not None:
+      tuner.bind(workers, limiter)
+
+    if (session is None) and (processes is None):
+      Session.grow(workers)
+
+    index = {key: 0 for key in payloads}
+    last = {key: None for key in payloads}
+    stopped = set()
+    result_ls = {key: {} for key in payloads}
+    errors = {key: {} for key in payloads}
+
+    if processes is None:
+      executor = concurrent.futures.ThreadPoolExecutor(max_workers = workers)
+    else:
+      executor = Pool.executor(processes, limiter)
+
+    pending = {}
+
+    # round-robin over the payloads that may have more pages
+    active = collections.deque(payloads)
+
+    def submit():
+
+      while (len(active) > 0) and (len(pending) < Page.limit(workers, tuner)):
+
+        key = active.popleft()
+
+        if (last[key] is not None) or (key in stopped):
+          continue
+
+        window = next(windows[key], None)
+
+        if window is None:
+          continue
+
+        offset, chunk_size = window
+
+        if processes is None:
+          future = executor.submit(Page.get, session, payloads[key], offset, chunk_size,
+                                   limiter, cache, "pandas", retry, stats, columns, tuner)
+        else:
+          future = executor.submit(Pool.get, payloads[key], offset, chunk_size, cache, retry,
+                                   columns)
+
+        pending[future] = (key, index[key], offset, chunk_size)
+        index[key] += 1
+
+        active.append(key)
+
+    def stop(key):
+
+      stopped.add(key)
+
+      # windows in flight and windows not yet requested are reported as failed
+      for other, (other_key, j, offset, chunk_size) in list(pending.items()):
+
+        if (other_key == key):
+
+          errors[key][j] = (offset, chunk_size)
+
+          if other.cancel():
+            del pending[other]
+
+      window = next(windows[key], None)
+
+      if window is not None:
+
+        end = payloads[key]["offset"] + payloads[key]["size"]
+        errors[key][index[key]] = (window[0], end - window[0])
+
+    try:
+
+      submit()
+
+      while (len(pending) > 0):
+
+        done, _ = concurrent.futures.wait(pending, return_when = concurrent.futures.FIRST_COMPLETED)
+
+        for future in done:
+
+          key, i, offset, chunk_size = pending.pop(future)
+          result_df = future.result()
+
+          if processes is not None:
+
+            result_df, events = result_df
+
+            for event in events:
+              stats.add(event.pop("phase"), event.pop("duration"), **event)
+
+          if (key in stopped) or ((last[key] is not None) and (i > last[key])):
+            continue
+
+          if result_df is None:
+
+            errors[key][i] = (offset, chunk_size)
+
+            if (len(errors[key]) >= workers):
+              stop(key)
+
+            continue
+
+          if (len(result_df) > 0):
+            result_ls[key][i] = result_df
+
+          # a short or empty page is the last page of its payload
+          if (len(result_df) < chunk_size):
+
+            last[key] = i
+
+            for j in [j for j in result_ls[key] if j > i]:
+              del result_ls[key][j]
+
+            for j in [j for j in errors[key] if j > i]:
+              del errors[key][j]
 
-def get(payload = None, session = None):
+            for other, (other_key, j, _, _) in list(pending.items()):
+              if (other_key == key) and (j > i) and other.cancel():
+                del pending[other]
+
+        submit()
+
+    finally:
+
+      for future in pending:
+        future.cancel()
+
+      executor.shutdown(wait = True)
+
+    result = {key: [value[i] for i in sorted(value)] for key, value in result_ls.items()}
+    failed = {key: Page.failed(payloads[key], value.values()) for key, value in errors.items()}
+
+    return result, failed
+
+def pages(payload = None, session = None, workers = 1, limiter = None, cache = None,
+          compact = False, output = "pandas", retry = None, failed = None, stats = None,
+          columns = None, tuner = None):
+  """
+  Iterate over Pages of Data from the Yahoo Finance API
+
+  A method to iterate over data from the Yahoo Finance API using the specified payload,
+  one page of up to 250 rows at a time. Each page is returned as soon as it arrives so
+  that results can be processed incrementally without holding all pages in memory.
+
+  Parameters:
+    payload (dict): payload that contains search criteria created using
+      the `create_query` and `create_payload` methods.
+    session (dict): session created using the `get_session` method. When a
+      session is not provided, the process-wide session is used.
+    workers (int): maximum number of pages to request concurrently. When
+      greater than one, pages are requested on a thread pool that shares the
+      session and the results are returned in the same order.
+    limiter (Limiter): rate limiter for the requests. When a limiter is not
+      provided, the process-wide limiter is used.
+    cache (Cache): cache of pages created using the `Cache` class. When a cache
+      is provided, unexpired pages are returned from the cache without a request.
+    compact (bool): whether to keep only the raw value of formatted fields, cast
+      numeric fields to numbers, and store repeated strings (e.g., exchange,
+      currency) as categories. A field is numeric when its type in `data_filters`
+      is numeric or its unit is "%", with quote keys matched to fields by
+      `Data.keys` or by name (e.g., "beta"), so the types of most quote keys are
+      inferred from their values. Requires the "pandas" output.
+    output (str): type of each page (i.e., "pandas", "arrow"). The "arrow" type
+      builds a `pyarrow.Table` directly from the response and requires pyarrow.
+    retry (Retry): retry policy for failed requests. When a policy is not
+      provided, the default `Retry` policy is used.
+    failed (list): list to which a payload is appended for each window of rows
+      that could not be requested after all attempts. The offset and size of each
+      payload are those of the window, so that only the failed windows can be
+      requested again.
+    stats (Stats): statistics created using the `Stats` class. When statistics
+      are provided, the time of each phase, the size of each response, and the
+      number of pages, retries, and failed pages are recorded.
+    columns (list): columns to keep from each quote (e.g., "symbol",
+      "regularMarketPrice", "marketCap.raw"). Each quote is reduced to the top-level
+      keys of the columns before it is normalized, which reduces the time and memory
+      of each page. The names are those of the quotes in the response, not the
+      fields in `data_filters`.
+    tuner (Tuner): adaptive tuner created using the `Tuner` class. When a tuner is
+      provided, the number of pages in flight, up to `workers`, and the rate of
+      requests are adjusted from the time and status of each response.
+
+  Returns:
+    A generator of data frames, one for each page of data from the Yahoo Finance API
+    for the specified search criteria.
+
+  Examples:
+    query = yfs.create_query(["eq", ["region", "us"]])
+
+    payload = yfs.create_payload("equity", query, size = 10000)
+
+    for page in yfs.iter_data(payload):
+      page.to_csv("data.csv", mode = "a", header = False)
+  """
+
+  Check.workers(workers)
+  Check.output(output)
+
+  if compact and (output != "pandas"):
+    raise ValueError("value of 'output' must be 'pandas' for 'compact'")
+
+  if columns is not None:
+    Check.columns(columns)
+
+  if payload is None:
+    payload = Payload.create()
+
+  if limiter is None:
+    limiter = Limiter.get()
+
+  if retry is None:
+    retry = Retry()
+
+  if stats is None:
+    stats = Stats()
+
+  if session is not None:
+    Session.cookies(session)
+
+  result = Page.iter(session, payload, workers, limiter, cache, compact, output, retry,
+                     failed, stats, columns, tuner)
+
+  return result
+
+def get(payload = None, session = None, workers = 1, limiter = None, cache = None,
+        shard = None, compact = False, output = "pandas", retry = None, failed = None,
+        stats = None, columns = None, processes = None, tuner = None):
   """
   Get Data from the Yahoo Finance API
 
@@ -560,11 +2936,57 @@ def get(payload = None, session = None):
     payload (dict): payload that contains search criteria created using
       the `create_query` and `create_payload` methods.
     session (dict): session created using the `get_session` method. When a
-      session is not provided, a session is created internally.
+      session is not provided, the process-wide session is used.
+    workers (int): maximum number of pages to request concurrently. When
+      greater than one, pages are requested on a thread pool that shares the
+      session and the results are returned in the same order.
+    limiter (Limiter): rate limiter for the requests. When a limiter is not
+      provided, the process-wide limiter is used.
+    cache (Cache): cache of pages created using the `Cache` class. When a cache
+      is provided, unexpired pages are returned from the cache without a request.
+    shard (str or tuple): field or a tuple of the field and its values used to split
+      the query into disjoint shards with the `Payload.shard` method. The shards are
+      requested together, using `workers` pages at a time, rows with the same
+      symbol are returned once, and the rows of all shards are sorted by the sort
+      field of the payload and cut to `offset` and `size`. Rows are only sorted when
+      the sort field has a key in the quotes (see `Data.keys`) that is not removed by
+      `columns`.
+    compact (bool): whether to keep only the raw value of formatted fields, cast
+      numeric fields to numbers, and store repeated strings (e.g., exchange,
+      currency) as categories. A field is numeric when its type in `data_filters`
+      is numeric or its unit is "%", with quote keys matched to fields by
+      `Data.keys` or by name (e.g., "beta"), so the types of most quote keys are
+      inferred from their values. Requires the "pandas" output.
+    output (str): type of the result (i.e., "pandas", "arrow"). The "arrow" type
+      builds a `pyarrow.Table` directly from each response and requires pyarrow.
+    retry (Retry): retry policy for failed requests. When a policy is not
+      provided, the default `Retry` policy is used.
+    failed (list): list to which a payload is appended for each window of rows
+      that failed after all attempts, which is how failed windows are reported when
+      `output` is "arrow" because a `pyarrow.Table` has no `attrs`.
+    stats (Stats): statistics created using the `Stats` class. When statistics
+      are provided, the time of each phase, the size of each response, and the
+      number of pages, retries, and failed pages are recorded.
+    columns (list): columns to keep from each quote (e.g., "symbol",
+      "regularMarketPrice", "marketCap.raw"). Each quote is reduced to the top-level
+      keys of the columns before it is normalized, which reduces the time and memory
+      of each page. The names are those of the quotes in the response, not the
+      fields in `data_filters`.
+    processes (int): number of worker processes that request and normalize the pages.
+      When processes are provided, each process uses its own session instead of
+      `session`, the limiter is shared by all processes, and `workers` is the number
+      of pages in flight across the processes. The processes are started for each
+      call and each requests its own crumb, so processes are only faster for calls
+      with many pages.
+    tuner (Tuner): adaptive tuner created using the `Tuner` class. When a tuner is
+      provided, the number of pages in flight, up to `workers`, and the rate of
+      requests are adjusted from the time and status of each response.
 
   Returns:
     A data frame that contains data from the Yahoo Finance API for the
-    specified search criteria.
+    specified search criteria. The "failed" key of its `attrs` is a list with
+    a payload for each window of rows that could not be requested after all
+    attempts (see `iter_data`).
 
   Examples:
     filters = [
@@ -580,83 +3002,327 @@ def get(payload = None, session = None):
     payload = yfs.create_payload("equity", query)
 
     data = yfs.get_data(payload)
+
+    data = yfs.get_data(payload, workers = 4)
+
+    data = yfs.get_data(payload, workers = 8, shard = "exchange")
+
+    data = yfs.get_data(payload, columns = ["symbol", "regularMarketPrice", "marketCap"])
+
+    data = yfs.get_data(payload, workers = 8, shard = "exchange", processes = 4)
   """
 
+  Check.output(output)
+
+  if compact and (output != "pandas"):
+    raise ValueError("value of 'output' must be 'pandas' for 'compact'")
+
   if payload is None:
     payload = Payload.create()
 
-  if session is None:
-    session = Session.get()
+  if stats is None:
+    stats = Stats()
 
-  crumb = session["crumb"]
-  cookies = session["cookies"]
-  handle = session["handle"]
+  if (shard is not None) or (processes is not None):
 
-  params = {
-    "crumb": crumb,
-    "lang": "en-US",
-    "region": "US",
-    "formatted": "true",
-    "corsDomain": "finance.yahoo.com",
-  }
+    if (output != "pandas"):
+      raise ValueError("value of 'output' must be 'pandas' for 'shard' and 'processes'")
 
-  api_url = "https://query1.finance.yahoo.com/v1/finance/screener"
+    if isinstance(shard, str):
+      shard = (shard,)
 
-  headers = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
-  }
+    # each shard requests the rows up to the end of the window, which are sorted and
+    # cut to the window after the shards are combined
+    if shard is not None:
+      payloads = Payload.shard(dict(payload, offset = 0, size = payload["offset"] + payload["size"]),
+                               *shard)
+    else:
+      payloads = [payload]
 
-  for key, value in cookies.items():
-    handle.cookies.set(key, value)
+    result_ls = batch(payloads, session, workers, limiter, cache, retry = retry,
+                      stats = stats, columns = columns, processes = processes, tuner = tuner)
 
-  count = 0
-  max_size = 250
-  size = payload["size"]
-  offset = payload["offset"]
+    errors = [value for result_df in result_ls.values() for value in result_df.attrs["failed"]]
+    result_ls = [value for value in result_ls.values() if (len(value) > 0)]
 
-  result_ls = []
+    if (len(result_ls) == 0):
+      result = pd.DataFrame()
+    else:
 
-  while (size > 0):
+      with stats.time("align"):
+        result = Process.align(result_ls)
 
-    chunk_size = min(size, max_size)
-    payload["size"] = chunk_size
-    payload["offset"] = offset
+      if (shard is not None):
 
-    try:
+        if ("symbol" in result.columns):
+          result = result.drop_duplicates(subset = "symbol", ignore_index = True)
 
-      response = handle.post(api_url, params = params, json = payload, headers = headers)
+        result = Process.sort(result, payload["sortField"], payload["sortType"])
+        result = result.iloc[payload["offset"]:payload["offset"] + payload["size"]]
+        result = result.reset_index(drop = True)
 
-      result = response.json()
-      result_df = result["finance"]["result"][0]["quotes"]
+      if compact:
+        with stats.time("compact"):
+          result = Process.compact(result, payload["quoteType"])
 
-    except:
-      result_df = pd.DataFrame()
+    result.attrs["failed"] = errors
 
-    if (len(result_df) > 0):
+    if failed is not None:
+      failed.extend(errors)
 
-      result_df = pd.json_normalize(result_df)
-      result_df = Process.cols(result_df)
+    return result
 
-      result_ls.append(result_df)
+  errors = []
+  # pages are compacted once after they are aligned instead of as they arrive
+  result_ls = list(pages(payload, session, workers, limiter, cache, False, output, retry,
+                         errors, stats, columns, tuner))
 
-      size -= chunk_size
-      offset += chunk_size
+  if failed is not None:
+    failed.extend(errors)
+
+  if (output == "arrow"):
+    with stats.time("align"):
+      return Process.concat(result_ls)
+
+  if (len(result_ls) == 0):
+    result = pd.DataFrame()
+  else:
+
+    with stats.time("align"):
+      result = Process.align(result_ls)
+
+    # categories of each page are combined after the pages are aligned
+    if compact:
+      with stats.time("compact"):
+        result = Process.compact(result, payload["quoteType"])
+
+  result.attrs["failed"] = errors
+
+  return result
+
+def batch(payloads, session = None, workers = 4, limiter = None, cache = None, concat = False,
+          retry = None, stats = None, columns = None, processes = None, tuner = None):
+  """
+  Get Data for Many Payloads from the Yahoo Finance API
+
+  A method to get data from the Yahoo Finance API for many payloads at once. The pages of
+  all payloads are scheduled together on one thread pool with one session, one rate
+  limiter, and one limit on the number of requests in flight.
 
+  Parameters:
+    payloads (dict or list): payloads created using the `create_payload` method. When
+      a list is provided, the position of each payload is used as its key.
+    session (dict): session created using the `get_session` method. When a
+      session is not provided, the process-wide session is used.
+    workers (int): maximum number of pages to request concurrently across all payloads.
+    limiter (Limiter): rate limiter for the requests. When a limiter is not
+      provided, the process-wide limiter is used.
+    cache (Cache): cache of pages created using the `Cache` class. When a cache
+      is provided, unexpired pages are returned from the cache without a request.
+    concat (bool): whether to return one data frame with a "key" column instead of
+      a dictionary of data frames.
+    retry (Retry): retry policy for failed requests. When a policy is not
+      provided, the default `Retry` policy is used.
+    stats (Stats): statistics created using the `Stats` class. When statistics
+      are provided, the time of each phase, the size of each response, and the
+      number of pages, retries, and failed pages are recorded.
+    columns (list): columns to keep from each quote (e.g., "symbol",
+      "regularMarketPrice", "marketCap.raw"). Each quote is reduced to the top-level
+      keys of the columns before it is normalized, which reduces the time and memory
+      of each page. The names are those of the quotes in the response, not the
+      fields in `data_filters`.
+    processes (int): number of worker processes that request and normalize the pages.
+      When processes are provided, each process uses its own session instead of
+      `session`, the limiter is shared by all processes, and `workers` is the number
+      of pages in flight across the processes. The processes are started for each
+      call and each requests its own crumb, so processes are only faster for calls
+      with many pages.
+    tuner (Tuner): adaptive tuner created using the `Tuner` class. When a tuner is
+      provided, the number of pages in flight, up to `workers`, and the rate of
+      requests are adjusted from the time and status of each response.
+
+  Returns:
+    A dictionary with a data frame for each key of the payloads or, when `concat` is
+    True, a data frame with the data of all payloads and a "key" column. The "failed"
+    key of the `attrs` of each data frame is a list of payloads for the windows of rows
+    that could not be requested after all attempts.
+
+  Examples:
+    payloads = {}
+
+    for region in ["us", "ca", "gb"]:
+
+      query = yfs.create_query(["eq", ["region", region]])
+      payloads[region] = yfs.create_payload("equity", query, size = 1000)
+
+    data = yfs.get_data_batch(payloads, workers = 8)
+  """
+
+  Check.workers(workers)
+
+  if columns is not None:
+    Check.columns(columns)
+
+  if processes is not None:
+
+    Check.processes(processes)
+
+    if tuner is not None:
+      raise ValueError("'tuner' cannot be used with 'processes'")
+
+  if not isinstance(payloads, dict):
+    payloads = dict(enumerate(payloads))
+
+  if limiter is None:
+    limiter = Limiter.get()
+
+  if retry is None:
+    retry = Retry()
+
+  if stats is None:
+    stats = Stats()
+
+  if session is not None:
+    Session.cookies(session)
+
+  result_ls, failed = Page.batch(session, payloads, workers, limiter, cache, retry, stats,
+                                 columns, processes, tuner)
+
+  result = {}
+
+  for key, value in result_ls.items():
+
+    if (len(value) == 0):
+      result[key] = pd.DataFrame()
     else:
-      size = 0
+      with stats.time("align"):
+        result[key] = Process.align(value)
 
-    count += 1
+    result[key].attrs["failed"] = failed[key]
 
-    if (count % 5 == 0):
+  if concat:
 
-      print("pause one second after five requests")
-      time.sleep(1)
+    result_ls = []
 
-  if (len(result_ls) == 0):
-    return pd.DataFrame()
+    for key, value in result.items():
+
+      value = value.copy()
+      value.insert(0, "key", key)
+
+      result_ls.append(value)
+
+    if (len(result_ls) == 0):
+      result = pd.DataFrame()
+    else:
+      result = Process.align(result_ls)
 
-  result = Process.align(result_ls)
+    result.attrs["failed"] = [value for key in failed for value in failed[key]]
 
   return result
 
+def write(path, payload = None, session = None, workers = 1, limiter = None, cache = None,
+          schema = None, retry = None, failed = None, stats = None, columns = None,
+          tuner = None):
+  """
+  Write Data from the Yahoo Finance API to a Parquet File
+
+  A method to write data from the Yahoo Finance API to a Parquet file while it is
+  downloaded. Each page is converted to a `pyarrow.Table` directly from the response
+  and written as a row group, so that the full result is not held in memory. Requires
+  pyarrow.
+
+  Parameters:
+    path (str): path of the Parquet file.
+    payload (dict): payload that contains search criteria created using
+      the `create_query` and `create_payload` methods.
+    session (dict): session created using the `get_session` method. When a
+      session is not provided, the process-wide session is used.
+    workers (int): maximum number of pages to request concurrently.
+    limiter (Limiter): rate limiter for the requests. When a limiter is not
+      provided, the process-wide limiter is used.
+    cache (Cache): cache of pages created using the `Cache` class. When a cache
+      is provided, unexpired pages are returned from the cache without a request.
+    schema (pyarrow.Schema): schema of the file. When a schema is not provided,
+      the schema of the first page is used with integer columns as floating point
+      and columns that are null on every row as strings. Columns of later pages
+      that are not in the schema are dropped and missing columns are null.
+    retry (Retry): retry policy for failed requests. When a policy is not
+      provided, the default `Retry` policy is used.
+    failed (list): list to which a payload is appended for each window of rows
+      that failed after all attempts. The rows of failed windows are not written.
+    stats (Stats): statistics created using the `Stats` class. When statistics
+      are provided, the time of each phase, the size of each response, and the
+      number of pages, retries, and failed pages are recorded.
+    columns (list): columns to keep from each quote (e.g., "symbol",
+      "regularMarketPrice", "marketCap.raw"). Each quote is reduced to the top-level
+      keys of the columns before it is normalized, which reduces the time and memory
+      of each page. The names are those of the quotes in the response, not the
+      fields in `data_filters`.
+    tuner (Tuner): adaptive tuner created using the `Tuner` class. When a tuner is
+      provided, the number of pages in flight, up to `workers`, and the rate of
+      requests are adjusted from the time and status of each response.
+
+  Returns:
+    The number of rows written.
+
+  Examples:
+    query = yfs.create_query(["eq", ["region", "us"]])
+
+    payload = yfs.create_payload("equity", query, size = 10000)
+
+    count = yfs.write_parquet("data.parquet", payload, workers = 4)
+  """
+
+  import pyarrow as pa
+  import pyarrow.parquet as pq
+
+  writer = None
+  count = 0
+
+  try:
+
+    for table in pages(payload, session, workers, limiter, cache, output = "arrow",
+                       retry = retry, failed = failed, stats = stats, columns = columns,
+                       tuner = tuner):
+
+      if schema is None:
+        schema = Process.schema(table.schema)
+
+      if writer is None:
+        writer = pq.ParquetWriter(path, schema)
+
+      arrays = []
+
+      for field in schema:
+
+        if (field.name in table.column_names):
+          arrays.append(table[field.name].cast(field.type))
+        else:
+          arrays.append(pa.nulls(len(table), field.type))
+
+      writer.write_table(pa.Table.from_arrays(arrays, schema = schema))
+      count += len(table)
+
+  except BaseException:
+
+    # a file that is not complete is removed instead of left with some row groups
+    if writer is not None:
+
+      writer.close()
+      writer = None
+
+      os.remove(path)
+
+    raise
+
+  finally:
+
+    if writer is not None:
+      writer.close()
+
+  return count
+
+Data.pages = pages
+Data.write = write
+Data.batch = batch
 Data.get = get